@@ -0,0 +1,182 @@
+"""Deterministic offline chat model for benchmarking the LangGraph pipeline.
+
+``FakeChatModel`` accepts the same constructor arguments the agents pass to
+``ChatOpenAI`` and answers each agent's prompt with a canned, schema-valid
+response built from the product in the shared context message. Latency is drawn
+from a configurable distribution, seeded by the prompt text so a given call
+always sleeps for the same time regardless of scheduling order, plus an optional
+``token_latency`` per completion token, so long replies take longer.
+
+    from benchmarks.fake_llm import FakeChatModel, parse_latency
+    from src.llm_clients import use_chat_model
+
+    FakeChatModel.latency = parse_latency("lognormal:0.2:0.5")
+    use_chat_model(FakeChatModel)
+"""
+
+import asyncio
+import json
+import math
+import random
+import re
+import time
+import zlib
+from typing import Any, Callable, ClassVar, Iterator, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from src import content_blocks
+from src.models import Product
+from src.prompt_context import CONTEXT_PREAMBLE
+from src.token_usage import count_message_tokens, count_tokens
+
+LatencyModel = Callable[[random.Random], float]
+
+CATEGORIES = ("Informational", "Safety", "Usage", "Purchase", "Comparison")
+# The first question shares its line with the "Questions: " label
+_QUESTION_LINE = re.compile(r"(?:^|Questions: )- \[(\w+)\] (.+)$", re.MULTILINE)
+
+
+def parse_latency(spec: str) -> LatencyModel:
+    """``const:S``, ``uniform:LO:HI`` or ``lognormal:MEDIAN:SIGMA`` (seconds)."""
+    kind, *params = spec.split(":")
+    values = [float(param) for param in params]
+    if kind == "const" and len(values) == 1:
+        return lambda rng: values[0]
+    if kind == "uniform" and len(values) == 2:
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == "lognormal" and len(values) == 2:
+        return lambda rng: rng.lognormvariate(math.log(values[0]), values[1])
+    raise ValueError(f"Unknown latency spec '{spec}'")
+
+
+def _product(messages: List[BaseMessage]) -> Product:
+    for message in messages:
+        content = str(message.content)
+        if content.startswith(CONTEXT_PREAMBLE):
+            return Product.from_dict(json.loads(content[len(CONTEXT_PREAMBLE) :]))
+    raise ValueError("Prompt has no shared product context")
+
+
+def _questions(product: Product) -> List[dict]:
+    return [
+        {"text": f"{category} question {index + 1} about {product.name}?", "category": category}
+        for index in range(3)
+        for category in CATEGORIES
+    ]
+
+
+def _faq_answer(product: Product, category: str) -> str:
+    if category == "Purchase":
+        return f"{product.name} costs {product.price}."
+    return f"{product.name}: answer for {category.lower()} question."
+
+
+def canned_reply(messages: List[BaseMessage]) -> str:
+    """Schema-valid response for whichever agent sent ``messages``."""
+    text = "\n".join(str(message.content) for message in messages)
+    product = _product(messages)
+    if "question generation agent" in text:
+        return json.dumps(_questions(product))
+    if "FAQ generation agent" in text:
+        faqs = [
+            {"question": question, "answer": _faq_answer(product, category), "category": category}
+            for category, question in _QUESTION_LINE.findall(text)
+        ]
+        return "```json\n" + json.dumps(faqs, ensure_ascii=False) + "\n```"
+    if "Answer this question" in text:
+        return f"{product.name} uses {product.concentration}."
+    if "product copywriter" in text:
+        return json.dumps({"description": f"{product.name} delivers {', '.join(product.benefits).lower()}."})
+    if "comparison page copywriter" in text:
+        return json.dumps({"primary": f"Choose {product.name} for faster results.", "alternative": "Choose B to start gently."})
+    if "comparison page generation agent" in text:
+        from src.agents_langchain import DEFAULT_RECOMMENDATIONS, PRODUCT_B
+
+        page = {
+            "template": "comparison_page",
+            "comparison": content_blocks.build_comparison(product, PRODUCT_B),
+            "who_should_choose_which": DEFAULT_RECOMMENDATIONS,
+        }
+        return json.dumps(page, ensure_ascii=False)
+    page = {
+        "template": "product_page",
+        "summary": content_blocks.build_core_summary(product),
+        "benefits": content_blocks.build_benefits_block(product),
+        "ingredients": content_blocks.build_ingredient_block(product),
+        "usage": content_blocks.build_usage_block(product),
+        "safety": content_blocks.build_safety_block(product),
+    }
+    return json.dumps(page, ensure_ascii=False)
+
+
+class FakeChatModel(BaseChatModel):
+    """Offline stand-in for ChatOpenAI; see the module docstring."""
+
+    model_name: str = "gpt-4o-mini"
+    temperature: float = 0.0
+    seed: int = 0
+    # Class-level so one setting covers every agent the workflow builds
+    latency: ClassVar[LatencyModel] = parse_latency("const:0")
+    # Seconds per completion token, on top of ``latency``
+    token_latency: ClassVar[float] = 0.0
+
+    def __init__(self, model: str = "gpt-4o-mini", max_retries: Optional[int] = None, **kwargs: Any) -> None:
+        super().__init__(model_name=model, **kwargs)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> "FakeChatModel":
+        # Replies never request tools, so tool-calling agents finish in one step
+        return self
+
+    def _delay(self, messages: List[BaseMessage]) -> float:
+        key = zlib.crc32("\n".join(str(message.content) for message in messages).encode("utf-8"))
+        return max(0.0, type(self).latency(random.Random(key ^ self.seed)))
+
+    def _result(self, messages: List[BaseMessage]) -> ChatResult:
+        reply = canned_reply(messages)
+        prompt_tokens = count_message_tokens(messages, self.model_name)
+        completion_tokens = count_tokens(reply, self.model_name)
+        message = AIMessage(
+            content=reply,
+            usage_metadata={
+                "input_tokens": prompt_tokens,
+                "output_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        )
+        return ChatResult(
+            generations=[ChatGeneration(message=message)],
+            llm_output={"token_usage": {"total_tokens": prompt_tokens + completion_tokens}},
+        )
+
+    def _generation_time(self, text: str) -> float:
+        return type(self).token_latency * count_tokens(text, self.model_name) if type(self).token_latency else 0.0
+
+    def _generate(self, messages: List[BaseMessage], stop: Any = None, run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        result = self._result(messages)
+        time.sleep(self._delay(messages) + self._generation_time(result.generations[0].message.content))
+        return result
+
+    async def _agenerate(
+        self, messages: List[BaseMessage], stop: Any = None, run_manager: Any = None, **kwargs: Any
+    ) -> ChatResult:
+        result = self._result(messages)
+        await asyncio.sleep(self._delay(messages) + self._generation_time(result.generations[0].message.content))
+        return result
+
+    def _stream(
+        self, messages: List[BaseMessage], stop: Any = None, run_manager: Any = None, **kwargs: Any
+    ) -> Iterator[ChatGenerationChunk]:
+        # Time to first token is the sampled latency; the rest arrives at ``token_latency``
+        time.sleep(self._delay(messages))
+        reply = canned_reply(messages)
+        for start in range(0, len(reply), 16):
+            piece = reply[start : start + 16]
+            time.sleep(self._generation_time(piece))
+            yield ChatGenerationChunk(message=AIMessageChunk(content=piece))
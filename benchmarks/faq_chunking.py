@@ -0,0 +1,78 @@
+"""Wall time of one FAQ page against the FAQ chunk size.
+
+Answers ``--questions`` questions for one product with ``FaqAgent`` at each
+``--chunk-sizes`` value (0 asks every question in one call), against
+``benchmarks.fake_llm.FakeChatModel`` with a per-token generation time, so long
+completions are slow as they are with a real provider. Also times one
+single-question FAQ call as the floor. Fully offline; run from the repository
+root:
+
+    python -m benchmarks.faq_chunking --questions 50 --chunk-sizes 0 25 10 5
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from benchmarks.fake_llm import CATEGORIES
+
+DATA_PATH = Path(__file__).resolve().parent.parent / "data" / "product_data.json"
+
+
+def make_questions(count: int) -> List[Dict[str, str]]:
+    return [
+        {"text": f"{CATEGORIES[index % len(CATEGORIES)]} question {index + 1}?", "category": CATEGORIES[index % len(CATEGORIES)]}
+        for index in range(count)
+    ]
+
+
+async def _time_page(chunk_size: int, state: Dict[str, Any], max_concurrency: int) -> float:
+    from src.agents_langchain import FaqAgent
+
+    agent = FaqAgent(max_concurrency=max_concurrency, chunk_size=chunk_size or None)
+    start = time.perf_counter()
+    result = await agent.arun(state)
+    elapsed = time.perf_counter() - start
+    assert len(result["faqs"]) == len(state["questions"])
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--questions", type=int, default=50)
+    parser.add_argument("--chunk-sizes", type=int, nargs="+", default=[0, 25, 10, 5])
+    parser.add_argument("--latency", default="const:0.3", help="fake LLM time to first token, e.g. const:0.3")
+    parser.add_argument("--token-latency", type=float, default=0.01, help="fake LLM seconds per completion token")
+    parser.add_argument("--max-concurrency", type=int, default=16, help="concurrent chunk calls")
+    args = parser.parse_args()
+
+    from benchmarks.fake_llm import FakeChatModel, parse_latency
+    from src.agents.data_ingestion_agent import parse_product
+    from src.llm_clients import use_chat_model
+    from src.llm_scheduler import configure_scheduler
+
+    os.environ.setdefault("OPENAI_API_KEY", "offline")
+    FakeChatModel.latency = parse_latency(args.latency)
+    FakeChatModel.token_latency = args.token_latency
+    use_chat_model(FakeChatModel)
+    configure_scheduler(requests_per_minute=10_000_000, tokens_per_minute=10_000_000_000, concurrency=64, max_concurrency=64)
+
+    product = parse_product(json.loads(DATA_PATH.read_text(encoding="utf-8")))
+    state = {"product": product, "questions": make_questions(args.questions)}
+    floor = asyncio.run(_time_page(1, {**state, "questions": state["questions"][:1]}, args.max_concurrency))
+
+    print(f"python {sys.version.split()[0]}, {args.questions} questions, fake LLM {args.latency} + {args.token_latency}s/token")
+    print(f"{'chunk size':<12}{'seconds':>9}{'x one-question call':>22}")
+    for chunk_size in args.chunk_sizes:
+        elapsed = asyncio.run(_time_page(chunk_size, state, args.max_concurrency))
+        print(f"{chunk_size or 'all':<12}{elapsed:>9.2f}{elapsed / floor:>22.1f}")
+    print(f"{'floor':<12}{floor:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""End-to-end throughput of both pipelines against a deterministic fake LLM.
+
+Runs the deterministic Orchestrator path and the LangGraph workflow (with
+``benchmarks.fake_llm.FakeChatModel`` in place of ChatOpenAI) at each catalog
+size, and reports products/sec, p50/p99 per-product latency and peak RSS. Every
+scenario runs in its own subprocess so peak RSS is per scenario. Fully offline;
+run from the repository root:
+
+    python -m benchmarks.pipeline_throughput --sizes 1 100 10000
+    python -m benchmarks.pipeline_throughput --json bench.json
+    python -m benchmarks.pipeline_throughput --baseline bench.json --tolerance 0.2
+
+With ``--baseline`` the exit status is 1 if any scenario's throughput dropped,
+or its p99 latency grew, by more than the tolerance.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from benchmarks.page_allocations import make_records
+
+PIPELINES = ("orchestrator", "langgraph")
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_orchestrator(records: List[Dict[str, Any]]) -> Tuple[float, List[float]]:
+    from src.orchestrator import Orchestrator
+
+    orchestrator = Orchestrator(max_workers=1)
+    latencies = []
+    began = time.perf_counter()
+    for raw in records:
+        start = time.perf_counter()
+        orchestrator.run_record(raw)
+        latencies.append(time.perf_counter() - start)
+    return time.perf_counter() - began, latencies
+
+
+async def _run_langgraph(paths: List[Path], max_in_flight: int) -> List[float]:
+    from src.workflow import build_workflow, product_input
+
+    workflow = build_workflow()
+    semaphore = asyncio.Semaphore(max_in_flight)
+    latencies: List[float] = []
+
+    async def one(path: Path) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            await workflow.ainvoke(product_input(path))
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(one(path) for path in paths))
+    return latencies
+
+
+def run_langgraph(records: List[Dict[str, Any]], latency: str, max_in_flight: int) -> Tuple[float, List[float]]:
+    from benchmarks.fake_llm import FakeChatModel, parse_latency
+    from src.llm_clients import use_chat_model
+    from src.llm_scheduler import configure_scheduler
+    from src.workflow import build_workflow
+
+    os.environ.setdefault("OPENAI_API_KEY", "offline")
+    FakeChatModel.latency = parse_latency(latency)
+    use_chat_model(FakeChatModel)
+    # Measure the pipeline, not the provider rate limits
+    configure_scheduler(
+        requests_per_minute=10_000_000,
+        tokens_per_minute=10_000_000_000,
+        concurrency=max_in_flight * 4,
+        max_concurrency=max_in_flight * 4,
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for index, raw in enumerate(records):
+            path = Path(tmp) / f"product_{index}.json"
+            path.write_text(json.dumps(raw, ensure_ascii=False), encoding="utf-8")
+            paths.append(path)
+        build_workflow()  # warm up imports; setup stays out of the measured time
+        began = time.perf_counter()
+        latencies = asyncio.run(_run_langgraph(paths, max_in_flight))
+        return time.perf_counter() - began, latencies
+
+
+def run_scenario(pipeline: str, size: int, latency: str, max_in_flight: int) -> Dict[str, Any]:
+    records = make_records(size)
+    if pipeline == "orchestrator":
+        elapsed, latencies = run_orchestrator(records)
+    else:
+        elapsed, latencies = run_langgraph(records, latency, max_in_flight)
+    return {
+        "pipeline": pipeline,
+        "products": size,
+        "seconds": round(elapsed, 3),
+        "products_per_second": round(size / elapsed, 2),
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 2),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 2),
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+    }
+
+
+def _subprocess(pipeline: str, size: int, args: argparse.Namespace) -> Dict[str, Any]:
+    command = [
+        sys.executable, "-m", "benchmarks.pipeline_throughput",
+        "--one", pipeline, str(size),
+        "--latency", args.latency,
+        "--max-in-flight", str(args.max_in_flight),
+    ]
+    output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def regressions(results: List[Dict[str, Any]], baseline: List[Dict[str, Any]], tolerance: float) -> List[str]:
+    previous = {(row["pipeline"], row["products"]): row for row in baseline}
+    failures = []
+    for row in results:
+        before = previous.get((row["pipeline"], row["products"]))
+        if before is None:
+            continue
+        name = f"{row['pipeline']} x{row['products']}"
+        if row["products_per_second"] < before["products_per_second"] * (1 - tolerance):
+            failures.append(f"{name}: {before['products_per_second']} -> {row['products_per_second']} products/s")
+        if row["p99_ms"] > before["p99_ms"] * (1 + tolerance):
+            failures.append(f"{name}: p99 {before['p99_ms']} -> {row['p99_ms']} ms")
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 100, 10000])
+    parser.add_argument("--pipelines", nargs="+", choices=PIPELINES, default=list(PIPELINES))
+    parser.add_argument("--latency", default="lognormal:0.05:0.5", help="fake LLM latency, e.g. const:0.1")
+    parser.add_argument("--max-in-flight", type=int, default=64, help="concurrent LangGraph products")
+    parser.add_argument("--json", type=Path, help="write results here (usable as a later --baseline)")
+    parser.add_argument("--baseline", type=Path, help="results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--one", nargs=2, metavar=("PIPELINE", "SIZE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.one:
+        pipeline, size = args.one
+        print(json.dumps(run_scenario(pipeline, int(size), args.latency, args.max_in_flight)))
+        return
+
+    print(f"python {sys.version.split()[0]}, fake LLM latency {args.latency}")
+    print(f"{'pipeline':<14}{'products':>9}{'prod/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'rss MB':>9}")
+    results = []
+    for pipeline in args.pipelines:
+        for size in args.sizes:
+            row = _subprocess(pipeline, size, args)
+            results.append(row)
+            print(
+                f"{pipeline:<14}{size:>9}{row['products_per_second']:>10}"
+                f"{row['p50_ms']:>10}{row['p99_ms']:>10}{row['peak_rss_mb']:>9}"
+            )
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+    if args.baseline:
+        failures = regressions(results, json.loads(args.baseline.read_text(encoding="utf-8")), args.tolerance)
+        for failure in failures:
+            print(f"REGRESSION {failure}")
+        if failures:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
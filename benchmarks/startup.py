@@ -0,0 +1,84 @@
+"""Import time and cold-start cost of the entry points.
+
+Each measurement runs in a fresh interpreter, as a CLI or serverless
+invocation would, and reports the median over ``--repeat`` runs together with
+the LLM framework packages the step loaded. Run from the repository root:
+
+    python -m benchmarks.startup --repeat 5
+    python -m benchmarks.startup --max-import-ms 150   # exit 1 if an import is slower
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+HEAVY = ("langchain", "langchain_core", "langchain_openai", "langgraph")
+
+# name -> (setup, timed statement); setup runs before the clock starts
+SCENARIOS: Dict[str, tuple] = {
+    "import src.orchestrator": ("", "import src.orchestrator"),
+    "import src.main": ("", "import src.main"),
+    "Orchestrator().run_record": (
+        "import json; from pathlib import Path; raw = json.loads(Path('data/product_data.json').read_text())",
+        "from src.orchestrator import Orchestrator; Orchestrator(max_workers=1).run_record(raw)",
+    ),
+    "build_workflow": (
+        "from pathlib import Path",
+        "from src.workflow import build_workflow; build_workflow(Path('data/product_data.json'))",
+    ),
+    "build_workflow + first agent": (
+        "import os; os.environ.setdefault('OPENAI_API_KEY', 'offline'); from pathlib import Path",
+        "from src.workflow import build_workflow, _LazyAgent; build_workflow(Path('data/product_data.json'));"
+        " _LazyAgent('QuestionGenerationAgent')._get()",
+    ),
+}
+
+_PROBE = """
+import sys, time
+{setup}
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+heavy = sorted(name for name in {heavy!r} if name in sys.modules)
+print(repr((elapsed, heavy)))
+"""
+
+
+def measure(setup: str, statement: str, repeat: int) -> Dict[str, object]:
+    samples: List[float] = []
+    heavy: List[str] = []
+    for _ in range(repeat):
+        code = _PROBE.format(setup=setup, statement=statement, heavy=HEAVY)
+        output = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+        elapsed, heavy = eval(output.strip().splitlines()[-1])
+        samples.append(elapsed)
+    return {"median_ms": round(statistics.median(samples) * 1000, 1), "loaded": heavy}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-import-ms", type=float, default=None, help="fail if an 'import' step is slower")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    results = {name: measure(setup, statement, args.repeat) for name, (setup, statement) in SCENARIOS.items()}
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"python {sys.version.split()[0]}, median of {args.repeat} fresh interpreters")
+        for name, result in results.items():
+            print(f"{name:<32}{result['median_ms']:>9} ms  loaded: {', '.join(result['loaded']) or '-'}")
+    if args.max_import_ms is not None:
+        slow = [name for name, result in results.items() if name.startswith("import") and result["median_ms"] > args.max_import_ms]
+        for name in slow:
+            print(f"REGRESSION {name}: {results[name]['median_ms']} ms > {args.max_import_ms} ms")
+        if slow:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
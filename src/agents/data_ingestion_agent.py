@@ -1,31 +1,44 @@
 import json
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from src.agents.base import Agent
 from src.models import Product
 
 
+def parse_product(raw: Dict[str, Any]) -> Product:
+    """Normalize one raw product record into a Product model."""
+    return Product(
+        name=raw["product_name"],
+        concentration=raw["concentration"],
+        skin_type=raw["skin_type"],
+        key_ingredients=raw["key_ingredients"],
+        benefits=raw["benefits"],
+        how_to_use=raw["how_to_use"],
+        side_effects=raw["side_effects"],
+        price=raw["price"],
+    )
+
+
 class DataIngestionAgent(Agent):
-    """Parses raw product JSON into a normalized Product model."""
+    """Parses raw product JSON into a normalized Product model.
+
+    A record already present in the payload under ``raw`` takes precedence over
+    ``data_path``, which lets catalog runs reuse one agent for many products. A
+    ``tracker`` in the payload is pointed at the parsed product.
+    """
 
-    def __init__(self, data_path: Path) -> None:
+    def __init__(self, data_path: Optional[Path] = None) -> None:
         super().__init__(name="data_ingestion_agent")
         self.data_path = data_path
 
     def run(self, payload: Dict[str, Any]) -> Dict[str, Any]:
-        del payload  # unused
-        raw = json.loads(self.data_path.read_text(encoding="utf-8"))
-        product = Product(
-            name=raw["product_name"],
-            concentration=raw["concentration"],
-            skin_type=list(raw["skin_type"]),
-            key_ingredients=list(raw["key_ingredients"]),
-            benefits=list(raw["benefits"]),
-            how_to_use=raw["how_to_use"],
-            side_effects=list(raw["side_effects"]),
-            price=raw["price"],
-        )
+        raw = payload.get("raw")
+        if raw is None:
+            if self.data_path is None:
+                raise ValueError("No raw record in payload and no data_path configured")
+            raw = json.loads(self.data_path.read_text(encoding="utf-8"))
+        product = parse_product(raw)
+        if payload.get("tracker") is not None:
+            payload["tracker"].observe(product)
         return {"product": product}
-
-
@@ -1,6 +1,7 @@
 from typing import Any, Dict, List
 
 from src.agents.base import Agent
+from src.incremental import tracked
 from src.models import Product, QA, Question
 from src.template_engine import TemplateEngine
 
@@ -37,10 +38,11 @@ class FaqAgent(Agent):
     def run(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         product: Product = payload["product"]
         questions: List[Question] = payload["questions"]
+        tracker = payload.get("tracker")
 
         faqs: List[Dict[str, str]] = []
         for q in questions:
-            answer = self._answer(q, product)
+            answer = tracked(tracker, f"faq:{q.category}:{q.text}", lambda p, q=q: self._answer(q, p), product)
             faqs.append(QA(question=q.text, answer=answer, category=q.category).__dict__)
 
         rendered = self.engine.render(
@@ -17,6 +17,7 @@ class ProductPageAgent(Agent):
         rendered = self.engine.render(
             template_name="product_page",
             context={"product": product},
+            tracker=payload.get("tracker"),
         )
         return {**payload, "product_page": rendered}
 
@@ -10,8 +10,7 @@ class QuestionGenerationAgent(Agent):
     def __init__(self) -> None:
         super().__init__(name="question_generation_agent")
 
-    def run(self, payload: Dict[str, Any]) -> Dict[str, Any]:
-        product: Product = payload["product"]
+    def _generate(self, product: Product) -> List[Question]:
         questions: List[Question] = []
 
         info_questions = [
@@ -53,6 +52,16 @@ class QuestionGenerationAgent(Agent):
         questions.extend(to_objects(safety_questions, "Safety"))
         questions.extend(to_objects(purchase_questions, "Purchase"))
         questions.extend(to_objects(comparison_questions, "Comparison"))
+        return questions
+
+    def run(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        product: Product = payload["product"]
+        tracker = payload.get("tracker")
+        if tracker is None:
+            questions = self._generate(product)
+        else:
+            items = tracker.compute("questions", lambda p: [q.__dict__ for q in self._generate(p)], product)
+            questions = [Question(**item) for item in items]
 
         return {"product": product, "questions": questions}
 
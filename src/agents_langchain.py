@@ -1,38 +1,105 @@
 """LangChain-based agents for the content generation system."""
 
+import asyncio
 import json
+import queue
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
 
-from langchain.agents import AgentExecutor, create_openai_tools_agent
-from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain_openai import ChatOpenAI
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.runnables.config import ContextThreadPoolExecutor
 
+from src import content_blocks
+from src.answer_reuse import AnswerReuseCache
+from src.agents.data_ingestion_agent import parse_product
+from src.json_stream import JsonArrayStream, NdjsonSink
+from src.llm_clients import chat_model, json_mode
 from src.models import Product, QA, Question
-from src.tools import get_all_tools
+from src.output_schemas import (
+    ComparisonPageOutput,
+    FaqItem,
+    ProductDescription,
+    ProductPageOutput,
+    QuestionList,
+    Recommendations,
+    parse_output,
+)
+from src.prompt_context import context_message, fill_placeholders, product_context
+
+
+# Fictional Product B used when the comparison agent falls back to the deterministic block
+PRODUCT_B = Product(
+    name="CalmRadiance Gentle C Serum",
+    concentration="5% Vitamin C",
+    skin_type=("Sensitive", "Dry"),
+    key_ingredients=("Vitamin C", "Aloe", "Hyaluronic Acid"),
+    benefits=("Gradual brightening", "Soothing hydration"),
+    how_to_use="Apply 3-4 drops in the morning or evening, after cleansing",
+    side_effects=("Rare mild redness",),
+    price="₹549",
+)
+
+# Questions and FAQ answers do not depend on these: their prompts show a placeholder,
+# filled in afterwards, so a price-only update is served from the LLM cache
+PLACEHOLDER_FIELDS: Tuple[str, ...] = ("price",)
+
+DEFAULT_RECOMMENDATIONS = {
+    "primary": "Choose GlowBoost for faster brightening and spot fading.",
+    "alternative": "Choose Product B if you want a gentler start with Vitamin C.",
+}
+
+
+def _tool_agent(llm: Any, prompt: ChatPromptTemplate) -> Any:
+    """AgentExecutor over the content block tools; langchain.agents loads only for this mode."""
+    from langchain.agents import AgentExecutor, create_openai_tools_agent
+
+    from src.tools import get_all_tools
+
+    tools = get_all_tools()
+    return AgentExecutor(agent=create_openai_tools_agent(llm, tools, prompt), tools=tools, verbose=False)
+
+
+def _normalize(text: str) -> str:
+    """Question text as compared when matching answers back to questions."""
+    return " ".join(text.lower().split()).rstrip("?.! ")
 
 
 class DataIngestionAgent:
-    """Agent that parses and validates product data."""
+    """Agent that parses and validates product data.
 
-    def __init__(self, data_path: Path):
+    The product comes from the input state: a raw ``product_data`` record or a
+    ``data_path`` to read, falling back to the ``data_path`` given here.
+    """
+
+    def __init__(self, data_path: Optional[Path] = None):
         self.data_path = data_path
 
     def run(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """Load and parse product data into internal model."""
-        data = json.loads(self.data_path.read_text())
-        product = Product(**data)
-        # Store as dict for LangGraph state compatibility
-        return {**state, "product": product.__dict__}
+        # Unset input keys read as empty values, not as missing
+        data = state.get("product_data")
+        if not data:
+            data_path = state.get("data_path") or self.data_path
+            if data_path is None:
+                raise ValueError("No product source: pass product_data or data_path in the input state")
+            data = json.loads(Path(data_path).read_text(encoding="utf-8"))
+        product = parse_product(data)
+        # The canonical Product instance is shared by reference; nodes return only the keys they write
+        return {"product": product}
+
+    async def arun(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Async variant of run; file I/O is moved off the event loop."""
+        return await asyncio.to_thread(self.run, state)
 
 
 class QuestionGenerationAgent:
     """Agent that generates categorized user questions using LLM."""
 
     def __init__(self):
-        llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.7)
+        llm = chat_model(model="gpt-4o-mini", temperature=0.7)
         prompt = ChatPromptTemplate.from_messages(
             [
+                context_message(),
                 (
                     "system",
                     """You are a question generation agent. Given product information, generate at least 15 user questions across these categories:
@@ -43,48 +110,66 @@ class QuestionGenerationAgent:
 - Comparison: Questions comparing this product to alternatives
 
 Return ONLY a JSON array of objects with "text" and "category" fields. Example:
-[{"text": "What does this product do?", "category": "Informational"}, ...]""",
+[{{"text": "What does this product do?", "category": "Informational"}}, ...]""",
                 ),
-                ("human", "Product: {product_info}\n\nGenerate categorized questions:"),
+                ("human", "Generate categorized questions:"),
             ]
         )
         chain = prompt | llm
         self.chain = chain
 
+    def _inputs(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        return {"product_context": product_context(state["product"], PLACEHOLDER_FIELDS)}
+
+    def _parse(self, response: Any) -> Dict[str, Any]:
+        questions = [Question(**item.model_dump()) for item in parse_output(response.content, QuestionList)]
+        # Store as list of dicts for LangGraph state compatibility
+        return {"questions": [q.__dict__ for q in questions]}
+
     def run(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """Generate questions from product data."""
-        product_dict = state["product"]
-        product = Product(**product_dict)
-        product_info = f"""
-Name: {product.name}
-Concentration: {product.concentration}
-Skin Type: {', '.join(product.skin_type)}
-Ingredients: {', '.join(product.key_ingredients)}
-Benefits: {', '.join(product.benefits)}
-How to Use: {product.how_to_use}
-Side Effects: {', '.join(product.side_effects)}
-Price: {product.price}
-"""
-        response = self.chain.invoke({"product_info": product_info})
-        content = response.content.strip()
-        # Extract JSON from markdown code blocks if present
-        if "```json" in content:
-            content = content.split("```json")[1].split("```")[0].strip()
-        elif "```" in content:
-            content = content.split("```")[1].split("```")[0].strip()
-        questions_data = json.loads(content)
-        questions = [Question(**q) for q in questions_data]
-        # Store as list of dicts for LangGraph state compatibility
-        return {**state, "questions": [q.__dict__ for q in questions]}
+        return self._parse(self.chain.invoke(self._inputs(state)))
 
+    async def arun(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Async variant of run."""
+        return self._parse(await self.chain.ainvoke(self._inputs(state)))
 
-class FaqAgent:
-    """Agent that generates FAQ answers using LLM."""
 
-    def __init__(self):
-        llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.3)
+class FaqAgent:
+    """Agent that generates FAQ answers using LLM.
+
+    Questions are answered in chunks of at most ``chunk_size`` (a category stays
+    in one chunk where it fits), one FAQ call per chunk, at most
+    ``max_concurrency`` at a time, and merged back in question order; so the
+    longest completion is one chunk's answers, not the whole page's. A
+    ``chunk_size`` of None asks every question in one call.
+
+    Every valid entry of a response is kept, even when the array is truncated
+    or some entries are malformed; only the questions left unanswered are asked
+    again, in one more round of chunk calls. If nothing was usable, or that
+    round also misses some, those questions are answered individually through
+    one shared chain. Rate limits and transient errors are retried by the LLM
+    scheduler under every call, so the chains add no retry layer of their own.
+
+    With ``stream_sink`` set (or a ``faq_sink`` path in the state), answers are
+    parsed while tokens arrive and each completed entry is appended to that
+    NDJSON file as soon as any chunk's stream finishes it.
+
+    With an ``answer_cache``, questions already answered for another product with
+    the same relevant fields are filled from it and only the rest are sent.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        stream_sink: Optional[Path] = None,
+        answer_cache: Optional[AnswerReuseCache] = None,
+        chunk_size: Optional[int] = 8,
+    ):
+        llm = chat_model(model="gpt-4o-mini", temperature=0.3)
         prompt = ChatPromptTemplate.from_messages(
             [
+                context_message(),
                 (
                     "system",
                     """You are an FAQ generation agent. Given a product and a list of questions, generate accurate, helpful answers.
@@ -98,87 +183,443 @@ Rules:
 - For Comparison questions, focus on what makes this product unique
 
 Return ONLY a JSON array of FAQ objects with "question", "answer", and "category" fields. Example:
-[{"question": "What does this product do?", "answer": "...", "category": "Informational"}, ...]""",
+[{{"question": "What does this product do?", "answer": "...", "category": "Informational"}}, ...]""",
                 ),
-                ("human", "Product: {product_info}\n\nQuestions: {questions}\n\nGenerate FAQ answers as JSON array:"),
+                ("human", "Questions: {questions}\n\nGenerate FAQ answers as JSON array:"),
             ]
         )
         self.chain = prompt | llm
 
-    def run(self, state: Dict[str, Any]) -> Dict[str, Any]:
-        """Generate FAQ answers for questions."""
-        product_dict = state["product"]
-        product = Product(**product_dict)
-        questions_data = state["questions"]
-        questions = [Question(**q) for q in questions_data]
-
-        product_info = f"""
-Name: {product.name}
-Concentration: {product.concentration}
-Skin Type: {', '.join(product.skin_type)}
-Ingredients: {', '.join(product.key_ingredients)}
-Benefits: {', '.join(product.benefits)}
-How to Use: {product.how_to_use}
-Side Effects: {', '.join(product.side_effects)}
-Price: {product.price}
-"""
-        questions_text = "\n".join([f"- [{q.category}] {q.text}" for q in questions])
+        # Use a simpler prompt for individual answers
+        answer_prompt = ChatPromptTemplate.from_messages(
+            [
+                context_message(),
+                (
+                    "system",
+                    "Answer this question about the product using ONLY the provided information. Be concise.",
+                ),
+                ("human", "Question: {question}\n\nAnswer:"),
+            ]
+        )
+        self.answer_chain = answer_prompt | llm
+        self.max_concurrency = max_concurrency
+        self.stream_sink = stream_sink
+        self.answer_cache = answer_cache
+        self.chunk_size = chunk_size
 
-        # Generate answers using LLM chain
-        response = self.chain.invoke(
-            {
-                "product_info": product_info,
-                "questions": questions_text,
-            }
+    def _inputs(self, product: Product, questions: List[Question]) -> Dict[str, Any]:
+        questions_text = "\n".join([f"- [{q.category}] {q.text}" for q in questions])
+        return {"product_context": product_context(product, PLACEHOLDER_FIELDS), "questions": questions_text}
+
+    def _chunks(self, questions: List[Question]) -> List[List[int]]:
+        """Question indices in chunks of at most ``chunk_size``, categories kept together.
+
+        A category is split only when it alone exceeds ``chunk_size``; smaller
+        ones share a chunk with the next.
+        """
+        size = self.chunk_size or len(questions)
+        by_category: Dict[str, List[int]] = {}
+        for index, q in enumerate(questions):
+            by_category.setdefault(q.category, []).append(index)
+        chunks: List[List[int]] = []
+        current: List[int] = []
+        for indices in by_category.values():
+            # An oversized category is split into near-equal pieces, not size + remainder
+            parts = -(-len(indices) // size)
+            for part in range(parts):
+                piece = indices[part * len(indices) // parts : (part + 1) * len(indices) // parts]
+                if len(current) + len(piece) > size:
+                    chunks.append(current)
+                    current = []
+                current += piece
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def _split(self, state: Dict[str, Any]) -> Tuple[Product, List[Question], Dict[int, Dict[str, str]], List[Question]]:
+        """Answers reusable from other products, by question index, and the questions still to ask."""
+        product: Product = state["product"]
+        questions = [Question(**q) for q in state["questions"]]
+        reused: Dict[int, Dict[str, str]] = {}
+        if self.answer_cache is not None:
+            for index, q in enumerate(questions):
+                answer = self.answer_cache.get(q.text, q.category, product)
+                if answer is not None:
+                    reused[index] = {"question": q.text, "answer": answer, "category": q.category}
+        pending = [q for index, q in enumerate(questions) if index not in reused]
+        return product, questions, reused, pending
+
+    def _remember(self, product: Product, question: Question, faq: Dict[str, str]) -> None:
+        # Only store answers the model clearly gave for this question
+        if self.answer_cache is not None and faq.get("question") == question.text and faq.get("answer"):
+            self.answer_cache.put(question.text, question.category, product, faq["answer"])
+
+    def _merge(
+        self, questions: List[Question], reused: Dict[int, Dict[str, str]], generated: List[Dict[str, str]]
+    ) -> List[Dict[str, str]]:
+        """Interleave reused and generated answers back into question order."""
+        generated_iter = iter(generated)
+        merged = []
+        for index in range(len(questions)):
+            faq = reused.get(index) or next(generated_iter, None)
+            if faq is not None:
+                merged.append(faq)
+        merged.extend(generated_iter)
+        return merged
+
+    def _valid(self, item: Any) -> Optional[Dict[str, str]]:
+        try:
+            return FaqItem.model_validate(item).model_dump()
+        except ValueError:
+            return None
+
+    def _salvage(self, text: str) -> List[Optional[Dict[str, str]]]:
+        """Every well-formed FAQ entry in the response, even if it is truncated or has bad entries.
+
+        Entries are parsed one by one, so a syntax error costs only its own entry; positions
+        are kept (a bad entry leaves ``None``) so entries can still be matched by order.
+        """
+        return [self._valid(item) for item in JsonArrayStream().feed(text)]
+
+    def _assign(
+        self, questions: List[Question], generated: Dict[int, Dict[str, str]], faq: Dict[str, str], position: int
+    ) -> Optional[int]:
+        """Record ``faq`` against the question it answers: by question text, else by its position."""
+        wanted = _normalize(faq["question"])
+        index = next(
+            (i for i, q in enumerate(questions) if i not in generated and _normalize(q.text) == wanted),
+            None,
+        )
+        if index is None and position < len(questions) and position not in generated:
+            index = position
+        if index is not None:
+            generated[index] = faq
+        return index
+
+    def _collect(self, questions: List[Question], faqs: List[Optional[Dict[str, str]]]) -> Dict[int, Dict[str, str]]:
+        generated: Dict[int, Dict[str, str]] = {}
+        for position, faq in enumerate(faqs):
+            if faq is not None:
+                self._assign(questions, generated, faq, position)
+        return generated
+
+    def _missing(self, questions: List[Question], generated: Dict[int, Dict[str, str]]) -> List[int]:
+        return [index for index in range(len(questions)) if index not in generated]
+
+    def _gather(
+        self, questions: List[Question], chunks: List[List[int]], responses: List[Any]
+    ) -> Dict[int, Dict[str, str]]:
+        generated: Dict[int, Dict[str, str]] = {}
+        for chunk, response in zip(chunks, responses):
+            # Cancellation and other non-Exception errors stop the run
+            if isinstance(response, BaseException) and not isinstance(response, Exception):
+                raise response
+            # A failed chunk call leaves its questions unanswered, to be asked again
+            if isinstance(response, Exception):
+                continue
+            found = self._collect([questions[index] for index in chunk], self._salvage(response.content))
+            generated.update((chunk[index], faq) for index, faq in found.items())
+        return generated
+
+    def _answer(self, product: Product, questions: List[Question]) -> Dict[int, Dict[str, str]]:
+        """Entries for ``questions`` by index, from one concurrent FAQ call per chunk."""
+        chunks = self._chunks(questions)
+        responses = self.chain.batch(
+            [self._inputs(product, [questions[index] for index in chunk]) for chunk in chunks],
+            config={"max_concurrency": self.max_concurrency},
+            return_exceptions=True,
+        )
+        return self._gather(questions, chunks, responses)
+
+    async def _aanswer(self, product: Product, questions: List[Question]) -> Dict[int, Dict[str, str]]:
+        """Async variant of _answer."""
+        chunks = self._chunks(questions)
+        responses = await self.chain.abatch(
+            [self._inputs(product, [questions[index] for index in chunk]) for chunk in chunks],
+            config={"max_concurrency": self.max_concurrency},
+            return_exceptions=True,
         )
-        answer_text = response.content.strip()
+        return self._gather(questions, chunks, responses)
+
+    def _complete(self, product: Product, pending: List[Question], generated: Dict[int, Dict[str, str]]) -> None:
+        """Answer the pending questions the reply left out, adding them to ``generated``.
+
+        If part of the reply was usable, only the unanswered questions are asked
+        again, in one round of chunk calls; whatever is still missing after that
+        (or everything, if nothing was usable) is answered per question.
+        """
+        missing = self._missing(pending, generated)
+        if missing and generated:
+            retry = [pending[index] for index in missing]
+            recovered = self._answer(product, retry)
+            generated.update((missing[index], faq) for index, faq in recovered.items())
+            missing = self._missing(pending, generated)
+        if missing:
+            # Fallback: answer each question through one shared, bounded batch
+            retry = [pending[index] for index in missing]
+            responses = self.answer_chain.batch(
+                self._fallback_inputs(product_context(product, PLACEHOLDER_FIELDS), retry),
+                config={"max_concurrency": self.max_concurrency},
+            )
+            generated.update(zip(missing, self._fallback_faqs(retry, responses)))
+
+    async def _acomplete(self, product: Product, pending: List[Question], generated: Dict[int, Dict[str, str]]) -> None:
+        """Async variant of _complete."""
+        missing = self._missing(pending, generated)
+        if missing and generated:
+            retry = [pending[index] for index in missing]
+            recovered = await self._aanswer(product, retry)
+            generated.update((missing[index], faq) for index, faq in recovered.items())
+            missing = self._missing(pending, generated)
+        if missing:
+            retry = [pending[index] for index in missing]
+            responses = await self.answer_chain.abatch(
+                self._fallback_inputs(product_context(product, PLACEHOLDER_FIELDS), retry),
+                config={"max_concurrency": self.max_concurrency},
+            )
+            generated.update(zip(missing, self._fallback_faqs(retry, responses)))
 
-        # Parse LLM response to extract FAQs
-        # Try to extract JSON from response
-        if "```json" in answer_text:
-            answer_text = answer_text.split("```json")[1].split("```")[0].strip()
-        elif "```" in answer_text:
-            answer_text = answer_text.split("```")[1].split("```")[0].strip()
+    def _fallback_inputs(self, context: str, questions: List[Question]) -> List[Dict[str, str]]:
+        return [{"product_context": context, "question": q.text} for q in questions]
 
-        try:
-            faqs_data = json.loads(answer_text)
-        except json.JSONDecodeError:
-            # Fallback: create FAQs from questions with generated answers
-            faqs_data = []
-            for q in questions:
-                # Use a simpler prompt for individual answers
-                simple_llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.3)
-                answer_prompt = ChatPromptTemplate.from_messages(
-                    [
-                        (
-                            "system",
-                            "Answer this question about the product using ONLY the provided information. Be concise.",
-                        ),
-                        ("human", "Product: {product_info}\n\nQuestion: {question}\n\nAnswer:"),
-                    ]
-                )
-                answer_chain = answer_prompt | simple_llm
-                answer_response = answer_chain.invoke({"product_info": product_info, "question": q.text})
-                answer = answer_response.content.strip()
-                faqs_data.append({"question": q.text, "answer": answer, "category": q.category})
-
-        faqs = [QA(**faq) for faq in faqs_data]
+    def _fallback_faqs(self, questions: List[Question], responses: List[Any]) -> List[Dict[str, str]]:
+        return [
+            {"question": q.text, "answer": response.content.strip(), "category": q.category}
+            for q, response in zip(questions, responses)
+        ]
+
+    def _filled(self, product: Product, faq: Dict[str, str]) -> Dict[str, str]:
+        """Entry with placeholders (see ``PLACEHOLDER_FIELDS``) replaced by the product's values."""
+        return {key: fill_placeholders(value, product, PLACEHOLDER_FIELDS) for key, value in faq.items()}
+
+    def _result(self, product: Product, faqs_data: List[Dict[str, str]]) -> Dict[str, Any]:
+        faqs = [QA(**self._filled(product, faq)) for faq in faqs_data]
         faq_page = {
             "template": "faq_page",
             "product": {"name": product.name},
             "faqs": [faq.__dict__ for faq in faqs],
         }
-        return {**state, "faqs": [faq.__dict__ for faq in faqs], "faq_page": faq_page}
+        return {"faqs": [faq.__dict__ for faq in faqs], "faq_page": faq_page}
+
+    def _stream_chunk(self, product: Product, questions: List[Question]) -> Iterator[Tuple[int, Dict[str, str]]]:
+        """(question index, entry) for each entry as soon as the model finishes it."""
+        parser = JsonArrayStream()
+        generated: Dict[int, Dict[str, str]] = {}
+        position = 0
+        for piece in self.chain.stream(self._inputs(product, questions)):
+            for item in parser.feed(piece.content):
+                faq = self._valid(item)
+                index = self._assign(questions, generated, faq, position) if faq is not None else None
+                position += 1
+                if index is not None:
+                    yield index, faq
+
+    async def _astream_chunk(
+        self, product: Product, questions: List[Question]
+    ) -> AsyncIterator[Tuple[int, Dict[str, str]]]:
+        """Async variant of _stream_chunk."""
+        parser = JsonArrayStream()
+        generated: Dict[int, Dict[str, str]] = {}
+        position = 0
+        async for piece in self.chain.astream(self._inputs(product, questions)):
+            for item in parser.feed(piece.content):
+                faq = self._valid(item)
+                index = self._assign(questions, generated, faq, position) if faq is not None else None
+                position += 1
+                if index is not None:
+                    yield index, faq
+
+    def _stream_chunks(self, product: Product, questions: List[Question]) -> Iterator[Tuple[int, Dict[str, str]]]:
+        """Stream every chunk concurrently; (question index, entry) in the order entries complete."""
+        chunks = self._chunks(questions)
+        finished = object()
+        results: "queue.Queue[Any]" = queue.Queue()
+
+        def stream_chunk(chunk: List[int]) -> None:
+            try:
+                for index, faq in self._stream_chunk(product, [questions[i] for i in chunk]):
+                    results.put((chunk[index], faq))
+            except Exception:
+                pass  # its questions are left unanswered and asked again
+            finally:
+                results.put(finished)
+
+        # Context-copying threads, so the calls still report to the run's callbacks
+        with ContextThreadPoolExecutor(max_workers=min(self.max_concurrency, len(chunks))) as pool:
+            for chunk in chunks:
+                pool.submit(stream_chunk, chunk)
+            remaining = len(chunks)
+            while remaining:
+                item = results.get()
+                if item is finished:
+                    remaining -= 1
+                else:
+                    yield item
+
+    async def _astream_chunks(
+        self, product: Product, questions: List[Question]
+    ) -> AsyncIterator[Tuple[int, Dict[str, str]]]:
+        """Async variant of _stream_chunks."""
+        chunks = self._chunks(questions)
+        finished = object()
+        results: "asyncio.Queue[Any]" = asyncio.Queue()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def stream_chunk(chunk: List[int]) -> None:
+            try:
+                async with semaphore:
+                    async for index, faq in self._astream_chunk(product, [questions[i] for i in chunk]):
+                        await results.put((chunk[index], faq))
+            except Exception:
+                pass  # its questions are left unanswered and asked again
+            finally:
+                await results.put(finished)
+
+        tasks = [asyncio.create_task(stream_chunk(chunk)) for chunk in chunks]
+        try:
+            remaining = len(chunks)
+            while remaining:
+                item = await results.get()
+                if item is finished:
+                    remaining -= 1
+                else:
+                    yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _entries(self, state: Dict[str, Any]) -> Iterator[Tuple[int, Dict[str, str]]]:
+        """(question index, entry) for each FAQ entry as soon as it is known."""
+        product, questions, reused, pending = self._split(state)
+        yield from reused.items()
+        positions = [index for index in range(len(questions)) if index not in reused]
+        if not pending:
+            return
+        generated: Dict[int, Dict[str, str]] = {}
+        for index, faq in self._stream_chunks(product, pending):
+            generated[index] = faq
+            self._remember(product, pending[index], faq)
+            yield positions[index], faq
+        missing = self._missing(pending, generated)
+        self._complete(product, pending, generated)
+        for index in missing:
+            self._remember(product, pending[index], generated[index])
+            yield positions[index], generated[index]
+
+    async def _aentries(self, state: Dict[str, Any]) -> AsyncIterator[Tuple[int, Dict[str, str]]]:
+        """Async variant of _entries."""
+        product, questions, reused, pending = self._split(state)
+        for item in reused.items():
+            yield item
+        positions = [index for index in range(len(questions)) if index not in reused]
+        if not pending:
+            return
+        generated: Dict[int, Dict[str, str]] = {}
+        async for index, faq in self._astream_chunks(product, pending):
+            generated[index] = faq
+            self._remember(product, pending[index], faq)
+            yield positions[index], faq
+        missing = self._missing(pending, generated)
+        await self._acomplete(product, pending, generated)
+        for index in missing:
+            self._remember(product, pending[index], generated[index])
+            yield positions[index], generated[index]
+
+    def stream(self, state: Dict[str, Any]) -> Iterator[QA]:
+        """Yield each FAQ entry as soon as it is known: reused answers first, then as the chunks emit them."""
+        for _, faq in self._entries(state):
+            yield QA(**self._filled(state["product"], faq))
+
+    async def astream(self, state: Dict[str, Any]) -> AsyncIterator[QA]:
+        """Async variant of stream."""
+        async for _, faq in self._aentries(state):
+            yield QA(**self._filled(state["product"], faq))
+
+    def _finish(
+        self,
+        product: Product,
+        questions: List[Question],
+        reused: Dict[int, Dict[str, str]],
+        pending: List[Question],
+        generated: List[Dict[str, str]],
+    ) -> Dict[str, Any]:
+        for q, faq in zip(pending, generated):
+            self._remember(product, q, faq)
+        return self._result(product, self._merge(questions, reused, generated))
+
+    def run(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Generate FAQ answers for questions."""
+        sink_path = state.get("faq_sink") or self.stream_sink
+        if sink_path is not None:
+            with NdjsonSink(Path(sink_path)) as sink:
+                entries: Dict[int, Dict[str, str]] = {}
+                for index, faq in self._entries(state):
+                    sink.write(self._filled(state["product"], faq))
+                    entries[index] = faq
+            # Entries arrive in completion order; the page keeps question order
+            return self._result(state["product"], [entries[index] for index in sorted(entries)])
+
+        product, questions, reused, pending = self._split(state)
+        if not pending:
+            return self._result(product, self._merge(questions, reused, []))
+
+        # Generate answers using LLM chain, keeping whatever part of each reply is usable
+        generated = self._answer(product, pending)
+        self._complete(product, pending, generated)
+        return self._finish(product, questions, reused, pending, [generated[i] for i in range(len(pending))])
+
+    async def arun(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Async variant of run."""
+        sink_path = state.get("faq_sink") or self.stream_sink
+        if sink_path is not None:
+            with NdjsonSink(Path(sink_path)) as sink:
+                entries: Dict[int, Dict[str, str]] = {}
+                async for index, faq in self._aentries(state):
+                    sink.write(self._filled(state["product"], faq))
+                    entries[index] = faq
+            return self._result(state["product"], [entries[index] for index in sorted(entries)])
+
+        product, questions, reused, pending = self._split(state)
+        if not pending:
+            return self._result(product, self._merge(questions, reused, []))
+
+        generated = await self._aanswer(product, pending)
+        await self._acomplete(product, pending, generated)
+        return self._finish(product, questions, reused, pending, [generated[i] for i in range(len(pending))])
 
 
 class ProductPageAgent:
-    """Agent that generates product page using tools and LLM."""
+    """Agent that generates product page using tools and LLM.
+
+    In ``direct`` mode the content blocks are built in code and a single LLM call
+    writes only the prose ``description``, instead of the model calling each tool
+    and then re-emitting the whole page.
+    """
+
+    def __init__(self, direct: bool = False):
+        self.direct = direct
+        if direct:
+            llm = chat_model(model="gpt-4o-mini", temperature=0.3)
+            prompt = ChatPromptTemplate.from_messages(
+                [
+                    context_message(),
+                    (
+                        "system",
+                        """You are a product copywriter. Write a 2-3 sentence product description using ONLY the provided product information.
+
+Return ONLY a JSON object with a "description" field.""",
+                    ),
+                    ("human", "Write the description:"),
+                ]
+            )
+            self.prose_chain = prompt | json_mode(llm)
+            return
 
-    def __init__(self):
-        llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.3)
-        tools = get_all_tools()
+        # AgentExecutor streams by default, which bypasses the LLM cache
+        llm = chat_model(model="gpt-4o-mini", temperature=0.3, disable_streaming=True)
         prompt = ChatPromptTemplate.from_messages(
             [
+                context_message(),
                 (
                     "system",
                     """You are a product page generation agent. Use the available tools to build structured content blocks, then assemble them into a complete product page.
@@ -192,58 +633,92 @@ Use these tools:
 
 After using tools, assemble the results into a JSON structure matching the product_page template.""",
                 ),
-                ("human", "Product data: {product_dict}\n\nGenerate product page:"),
+                ("human", "Generate product page:"),
                 MessagesPlaceholder(variable_name="agent_scratchpad"),
             ]
         )
-        agent = create_openai_tools_agent(llm, tools, prompt)
-        self.executor = AgentExecutor(agent=agent, tools=tools, verbose=False)
+        self.executor = _tool_agent(llm, prompt)
+
+    def _assemble(self, product: Product) -> Dict[str, Any]:
+        return {
+            "template": "product_page",
+            "summary": content_blocks.build_core_summary(product),
+            "benefits": content_blocks.build_benefits_block(product),
+            "ingredients": content_blocks.build_ingredient_block(product),
+            "usage": content_blocks.build_usage_block(product),
+            "safety": content_blocks.build_safety_block(product),
+        }
 
-    def run(self, state: Dict[str, Any]) -> Dict[str, Any]:
-        """Generate product page."""
-        product_dict = state["product"]
+    def _page(self, output: str, product: Product) -> Dict[str, Any]:
+        try:
+            return parse_output(output, ProductPageOutput).model_dump()
+        except ValueError:
+            # Fallback: build from the content blocks directly
+            return self._assemble(product)
 
-        response = self.executor.invoke({"product_dict": json.dumps(product_dict)})
-        output = response["output"]
+    def _direct_page(self, output: str, product: Product) -> Dict[str, Any]:
+        try:
+            description = parse_output(output, ProductDescription).description
+        except ValueError:
+            # Plain prose instead of the requested object is still a usable description
+            description = output.strip()
+        return {**self._assemble(product), "description": description}
 
-        # Extract JSON from response
-        if "```json" in output:
-            output = output.split("```json")[1].split("```")[0].strip()
-        elif "```" in output:
-            output = output.split("```")[1].split("```")[0].strip()
+    def _inputs(self, product: Product) -> Dict[str, str]:
+        return {"product_context": product_context(product)}
 
-        try:
-            product_page = json.loads(output)
-        except json.JSONDecodeError:
-            # Fallback: build using tools directly
-            from src.tools import (
-                build_benefits_block,
-                build_core_summary,
-                build_ingredient_block,
-                build_safety_block,
-                build_usage_block,
-            )
+    def run(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Generate product page."""
+        product: Product = state["product"]
+
+        if self.direct:
+            response = self.prose_chain.invoke(self._inputs(product))
+            return {"product_page": self._direct_page(response.content, product)}
+        response = self.executor.invoke(self._inputs(product))
+        return {"product_page": self._page(response["output"], product)}
 
-            product_page = {
-                "template": "product_page",
-                "summary": build_core_summary.invoke(product_dict),
-                "benefits": build_benefits_block.invoke(product_dict),
-                "ingredients": build_ingredient_block.invoke(product_dict),
-                "usage": build_usage_block.invoke(product_dict),
-                "safety": build_safety_block.invoke(product_dict),
-            }
+    async def arun(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Async variant of run."""
+        product: Product = state["product"]
 
-        return {**state, "product_page": product_page}
+        if self.direct:
+            response = await self.prose_chain.ainvoke(self._inputs(product))
+            return {"product_page": self._direct_page(response.content, product)}
+        response = await self.executor.ainvoke(self._inputs(product))
+        return {"product_page": self._page(response["output"], product)}
 
 
 class ComparisonAgent:
-    """Agent that generates comparison page using tools and LLM."""
+    """Agent that generates comparison page using tools and LLM.
+
+    In ``direct`` mode the comparison block is built in code against the fixed
+    Product B, and one LLM call writes only the ``who_should_choose_which`` prose.
+    """
+
+    def __init__(self, direct: bool = False):
+        self.direct = direct
+        if direct:
+            llm = chat_model(model="gpt-4o-mini", temperature=0.5)
+            prompt = ChatPromptTemplate.from_messages(
+                [
+                    context_message(),
+                    (
+                        "system",
+                        """You are a comparison page copywriter. Given Product A and Product B, write one recommendation sentence for each: who should choose Product A and who should choose Product B. Use ONLY the provided product information.
+
+Return ONLY a JSON object with "primary" and "alternative" fields.""",
+                    ),
+                    ("human", "The product above is Product A (primary).\n\nProduct B (alternative): {product_b_dict}\n\nWrite the recommendations:"),
+                ]
+            )
+            self.prose_chain = prompt | json_mode(llm)
+            return
 
-    def __init__(self):
-        llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.5)
-        tools = get_all_tools()
+        # AgentExecutor streams by default, which bypasses the LLM cache
+        llm = chat_model(model="gpt-4o-mini", temperature=0.5, disable_streaming=True)
         prompt = ChatPromptTemplate.from_messages(
             [
+                context_message(),
                 (
                     "system",
                     """You are a comparison page generation agent. Given Product A (GlowBoost) and a fictional Product B, use the build_comparison_block tool to create a structured comparison.
@@ -257,53 +732,55 @@ Product B should be fictional but realistic:
 
 After using the comparison tool, add a "who_should_choose_which" section with recommendations.""",
                 ),
-                ("human", "Product A (primary): {product_a_dict}\n\nGenerate comparison with fictional Product B:"),
+                ("human", "The product above is Product A (primary).\n\nGenerate comparison with fictional Product B:"),
                 MessagesPlaceholder(variable_name="agent_scratchpad"),
             ]
         )
-        agent = create_openai_tools_agent(llm, tools, prompt)
-        self.executor = AgentExecutor(agent=agent, tools=tools, verbose=False)
+        self.executor = _tool_agent(llm, prompt)
 
-    def run(self, state: Dict[str, Any]) -> Dict[str, Any]:
-        """Generate comparison page."""
-        product_a_dict = state["product"]
-
-        # Create fictional Product B
-        product_b_dict = {
-            "name": "CalmRadiance Gentle C Serum",
-            "concentration": "5% Vitamin C",
-            "skin_type": ["Sensitive", "Dry"],
-            "key_ingredients": ["Vitamin C", "Aloe", "Hyaluronic Acid"],
-            "benefits": ["Gradual brightening", "Soothing hydration"],
-            "how_to_use": "Apply 3-4 drops in the morning or evening, after cleansing",
-            "side_effects": ["Rare mild redness"],
-            "price": "₹549",
+    def _assemble(self, product: Product, who_should_choose_which: Dict[str, str]) -> Dict[str, Any]:
+        return {
+            "template": "comparison_page",
+            "comparison": content_blocks.build_comparison(product, PRODUCT_B),
+            "who_should_choose_which": who_should_choose_which,
         }
 
-        response = self.executor.invoke({"product_a_dict": json.dumps(product_a_dict)})
-        output = response["output"]
-
-        # Extract JSON from response
-        if "```json" in output:
-            output = output.split("```json")[1].split("```")[0].strip()
-        elif "```" in output:
-            output = output.split("```")[1].split("```")[0].strip()
+    def _page(self, output: str, product: Product) -> Dict[str, Any]:
+        try:
+            return parse_output(output, ComparisonPageOutput).model_dump()
+        except ValueError:
+            # Fallback: build from the comparison block directly
+            return self._assemble(product, DEFAULT_RECOMMENDATIONS)
 
+    def _direct_page(self, output: str, product: Product) -> Dict[str, Any]:
         try:
-            comparison_page = json.loads(output)
-        except json.JSONDecodeError:
-            # Fallback: build using tool directly
-            from src.tools import build_comparison_block
-
-            comparison = build_comparison_block.invoke(product_a_dict, product_b_dict)
-            comparison_page = {
-                "template": "comparison_page",
-                "comparison": comparison,
-                "who_should_choose_which": {
-                    "primary": "Choose GlowBoost for faster brightening and spot fading.",
-                    "alternative": "Choose Product B if you want a gentler start with Vitamin C.",
-                },
-            }
-
-        return {**state, "comparison_page": comparison_page}
+            who_should_choose_which = parse_output(output, Recommendations).model_dump()
+        except ValueError:
+            who_should_choose_which = DEFAULT_RECOMMENDATIONS
+        return self._assemble(product, who_should_choose_which)
 
+    def _inputs(self, product: Product) -> Dict[str, str]:
+        inputs = {"product_context": product_context(product)}
+        if self.direct:
+            inputs["product_b_dict"] = json.dumps(PRODUCT_B.to_dict(), ensure_ascii=False)
+        return inputs
+
+    def run(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Generate comparison page."""
+        product: Product = state["product"]
+
+        if self.direct:
+            response = self.prose_chain.invoke(self._inputs(product))
+            return {"comparison_page": self._direct_page(response.content, product)}
+        response = self.executor.invoke(self._inputs(product))
+        return {"comparison_page": self._page(response["output"], product)}
+
+    async def arun(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Async variant of run."""
+        product: Product = state["product"]
+
+        if self.direct:
+            response = await self.prose_chain.ainvoke(self._inputs(product))
+            return {"comparison_page": self._direct_page(response.content, product)}
+        response = await self.executor.ainvoke(self._inputs(product))
+        return {"comparison_page": self._page(response["output"], product)}
@@ -0,0 +1,150 @@
+"""Cross-product reuse of FAQ answers.
+
+Most generated questions differ between SKUs only in product-specific tokens
+("How should I apply GlowBoost ..."). Questions are normalized by masking every
+product field value they mention, and an answer is keyed on its category, the
+masked question and the values of only the fields that answer depends on: the
+category's declared fields plus any field the question itself mentions. The
+product name is masked in the stored answer and filled back in on reuse, so a
+product whose relevant fields match an earlier one gets that answer without an
+LLM call.
+
+An answer can still state facts outside those fields (the concentration in a
+Purchase answer, a shortened product name). Every field whose value the
+answer quotes is stored with it, and the answer is reused only for products
+with the same values for those fields too.
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple, Union
+
+from src.models import Product
+
+# Fields an answer in each category may state as fact; anything else must not vary its answer
+CATEGORY_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "Informational": ("concentration", "key_ingredients", "benefits"),
+    "Usage": ("how_to_use", "skin_type"),
+    "Safety": ("skin_type", "side_effects", "concentration"),
+    "Purchase": ("price",),
+    "Comparison": ("concentration", "key_ingredients", "benefits", "price"),
+}
+# Unknown categories depend on every field except the (masked) name
+_ALL_FIELDS = ("concentration", "skin_type", "key_ingredients", "benefits", "how_to_use", "side_effects", "price")
+_NAME_MASK = "<<product>>"
+_SPACE = re.compile(r"\s+")
+_NUMBER = re.compile(r"\d+(?:[.,]\d+)*\s*%?")
+
+
+def _field_tokens(product: Product) -> List[Tuple[str, str]]:
+    """(field, text) pairs a question may quote, longest first so joined lists mask before items."""
+    tokens: List[Tuple[str, str]] = [("name", product.name)]
+    for field in _ALL_FIELDS:
+        value = getattr(product, field)
+        if isinstance(value, tuple):
+            tokens.append((field, ", ".join(value)))
+            tokens.extend((field, item) for item in value)
+        else:
+            tokens.append((field, value))
+    return sorted((t for t in tokens if t[1]), key=lambda t: len(t[1]), reverse=True)
+
+
+def _mentions(text: str, token: str) -> bool:
+    # Whole tokens only; \b does not work for values that end in "%" or start with "₹"
+    return re.search(rf"(?<!\w){re.escape(token)}(?!\w)", text, re.IGNORECASE) is not None
+
+
+def _answer_tokens(product: Product) -> List[Tuple[str, str]]:
+    """(field, text) pairs that show an answer states that field: its values, the
+    numbers in them ("10%", "699") and leading words of the name ("GlowBoost")."""
+    tokens = _field_tokens(product)
+    words = product.name.split()
+    tokens.extend(("name", " ".join(words[:count])) for count in range(1, len(words)))
+    for field, value in list(tokens):
+        if field != "name":
+            tokens.extend((field, number.strip()) for number in _NUMBER.findall(value))
+    # Very short fragments ("C", "2") would match almost any answer
+    return [(field, token) for field, token in tokens if len(token) >= 3 or _NUMBER.fullmatch(token) and "%" in token]
+
+
+def answer_fields(answer: str, product: Product) -> FrozenSet[str]:
+    """Fields whose values ``answer`` quotes; ``name`` only for a partial name, the full one is masked."""
+    text = answer.replace(product.name, _NAME_MASK)
+    return frozenset(field for field, token in _answer_tokens(product) if _mentions(text, token))
+
+
+def _values(product: Product, fields: List[str]) -> str:
+    return json.dumps({field: getattr(product, field) for field in fields}, ensure_ascii=False)
+
+
+def mask_question(text: str, product: Product) -> Tuple[str, FrozenSet[str]]:
+    """Normalized question with product values replaced by ``<field>``, and the fields masked."""
+    masked = _SPACE.sub(" ", text).strip()
+    mentioned = set()
+    for field, token in _field_tokens(product):
+        # Whole tokens only, as in _mentions
+        pattern = re.compile(rf"(?<!\w){re.escape(token)}(?!\w)", re.IGNORECASE)
+        masked, count = pattern.subn(f"<{field}>", masked)
+        if count:
+            mentioned.add(field)
+    return masked.lower().rstrip("?.! "), frozenset(mentioned)
+
+
+class AnswerReuseCache:
+    """SQLite-backed answer store shared by every product in a run (and across runs with a path)."""
+
+    def __init__(self, path: Union[Path, str] = ":memory:", namespace: str = "") -> None:
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.namespace = namespace
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None, timeout=30)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        # fields/"values": the fields the answer quotes beyond its key, and their values when stored
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS answer_entries (key TEXT NOT NULL, fields TEXT NOT NULL,"
+            " field_values TEXT NOT NULL, answer TEXT NOT NULL, PRIMARY KEY (key, fields, field_values))"
+        )
+
+    def _fields(self, question: str, category: str, product: Product) -> Tuple[str, FrozenSet[str]]:
+        masked, mentioned = mask_question(question, product)
+        return masked, frozenset((set(CATEGORY_FIELDS.get(category, _ALL_FIELDS)) | mentioned) - {"name"})
+
+    def key(self, question: str, category: str, product: Product) -> str:
+        masked, fields = self._fields(question, category, product)
+        payload = json.dumps([self.namespace, category, masked, _values(product, sorted(fields))], ensure_ascii=False)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def get(self, question: str, category: str, product: Product) -> Optional[str]:
+        key = self.key(question, category, product)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT fields, field_values, answer FROM answer_entries WHERE key = ?", (key,)
+            ).fetchall()
+            for fields, values, answer in rows:
+                if _values(product, json.loads(fields)) == values:
+                    self.hits += 1
+                    return answer.replace(_NAME_MASK, product.name)
+            self.misses += 1
+        return None
+
+    def put(self, question: str, category: str, product: Product, answer: str) -> None:
+        _, keyed = self._fields(question, category, product)
+        extra = sorted(answer_fields(answer, product) - keyed)
+        stored = answer.replace(product.name, _NAME_MASK)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO answer_entries (key, fields, field_values, answer) VALUES (?, ?, ?, ?)",
+                (self.key(question, category, product), json.dumps(extra), _values(product, extra), stored),
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
@@ -1,5 +1,9 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass
-from typing import Any, Dict, List, Set
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from src.metrics import RunMetrics, payload_size
 
 
 @dataclass
@@ -10,27 +14,103 @@ class Node:
 
 
 class AutomationGraph:
-    """Lightweight DAG runner."""
+    """Lightweight DAG runner.
+
+    Every node is dispatched as soon as its ``depends_on`` set has completed, with up
+    to ``max_workers`` nodes running at once. Each node receives its own shallow copy
+    of the state and its result is merged back as a delta: keys that are new or bound
+    to a different object than in the node's input are writes, everything else is
+    left untouched, so a node returning a fresh dict never drops sibling outputs.
+    Two nodes writing the same key is an error unless one depends on the other.
+
+    With ``metrics``, every node records its wall time, the time it waited for a
+    worker after becoming ready, and the serialized size of its result.
+    """
 
-    def __init__(self, nodes: List[Node]) -> None:
+    def __init__(self, nodes: List[Node], max_workers: int = 4, metrics: Optional[RunMetrics] = None) -> None:
         self.nodes = {node.name: node for node in nodes}
+        self.max_workers = max_workers
+        self.metrics = metrics
+
+    def _call(self, name: str, snapshot: Dict[str, Any], ready_at: float) -> Dict[str, Any]:
+        agent = self.nodes[name].agent
+        if self.metrics is None:
+            return agent.run(dict(snapshot))
+        start = time.perf_counter()
+        result = agent.run(dict(snapshot))
+        self.metrics.span(
+            "node",
+            name,
+            start,
+            time.perf_counter(),
+            {"pipeline": "automation_graph", "node": name},
+            queue_wait_seconds=start - ready_at,
+            payload_bytes=payload_size(result),
+        )
+        return result
+
+    def _ancestors(self, name: str) -> Set[str]:
+        seen: Set[str] = set()
+        stack = list(self.nodes[name].depends_on)
+        while stack:
+            dep = stack.pop()
+            if dep in seen or dep not in self.nodes:
+                continue
+            seen.add(dep)
+            stack.extend(self.nodes[dep].depends_on)
+        return seen
+
+    def _merge(
+        self,
+        state: Dict[str, Any],
+        snapshot: Dict[str, Any],
+        result: Dict[str, Any],
+        name: str,
+        writers: Dict[str, str],
+    ) -> None:
+        for key, value in result.items():
+            if key in snapshot and snapshot[key] is value:
+                continue
+            writer = writers.get(key)
+            if writer is not None and writer not in self._ancestors(name):
+                raise RuntimeError(f"Nodes '{writer}' and '{name}' both write '{key}'")
+            state[key] = value
+            writers[key] = name
 
     def run(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        state = dict(payload)
+        writers: Dict[str, str] = {}
         executed: Set[str] = set()
+        pending = dict(self.nodes)
 
-        while len(executed) < len(self.nodes):
-            progressed = False
-            for name, node in self.nodes.items():
-                if name in executed:
-                    continue
-                if not set(node.depends_on).issubset(executed):
-                    continue
-                payload = node.agent.run(payload)
-                executed.add(name)
-                progressed = True
-            if not progressed:
-                unresolved = set(self.nodes.keys()) - executed
-                raise RuntimeError(f"Circular or missing dependencies: {unresolved}")
-        return payload
+        def ready() -> List[str]:
+            return [name for name, node in pending.items() if set(node.depends_on).issubset(executed)]
 
+        if self.max_workers <= 1:
+            while pending:
+                names = ready()
+                if not names:
+                    raise RuntimeError(f"Circular or missing dependencies: {set(pending)}")
+                ready_at = time.perf_counter()
+                for name in names:
+                    snapshot = dict(state)
+                    pending.pop(name)
+                    self._merge(state, snapshot, self._call(name, snapshot, ready_at), name, writers)
+                    executed.add(name)
+            return state
 
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            running: Dict[Future, Tuple[str, Dict[str, Any]]] = {}
+            while pending or running:
+                for name in ready():
+                    snapshot = dict(state)
+                    pending.pop(name)
+                    running[pool.submit(self._call, name, snapshot, time.perf_counter())] = (name, snapshot)
+                if not running:
+                    raise RuntimeError(f"Circular or missing dependencies: {set(pending)}")
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, snapshot = running.pop(future)
+                    self._merge(state, snapshot, future.result(), name, writers)
+                    executed.add(name)
+        return state
@@ -0,0 +1,234 @@
+"""Catalog batch runner that fans products out across a process pool."""
+
+import argparse
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from src.agents.comparison_agent import ALTERNATIVE
+from src.catalog_index import NdjsonCatalog, shard_range
+from src.columnar import CatalogColumns, render_columns
+from src.incremental import FingerprintStore
+from src.orchestrator import Orchestrator
+from src.template_engine import TemplateEngine
+from src.templates import build_engine
+
+PAGE_KEYS = ("faq_page", "product_page", "comparison_page")
+# FAQ pages need per-product question generation, so bulk mode covers block-built pages only
+COLUMNAR_PAGE_KEYS = ("product_page", "comparison_page")
+
+# Directory sources are shipped to workers as records; NDJSON exports as (start, stop)
+# record ranges that each worker decodes from its own memory map.
+Chunk = Union[List[Dict[str, Any]], Tuple[int, int]]
+
+_worker_orchestrator: Optional[Orchestrator] = None
+_worker_engine: Optional[TemplateEngine] = None
+_worker_catalog: Optional[NdjsonCatalog] = None
+
+
+@dataclass
+class CatalogReport:
+    """Summary of a catalog run."""
+
+    products: int
+    seconds: float
+    workers: int
+    chunk_size: int
+    units_reused: int = 0
+    units_recomputed: int = 0
+
+    @property
+    def products_per_sec(self) -> float:
+        return self.products / self.seconds if self.seconds else 0.0
+
+
+def iter_records(source: Path, shard: Optional[Tuple[int, int]] = None) -> Iterator[Dict[str, Any]]:
+    """Yield raw product records from a JSONL file or a directory of JSON files.
+
+    ``shard`` is ``(index, count)`` and restricts the run to that slice of records.
+    """
+    if source.is_dir():
+        paths = sorted(source.glob("*.json"))
+        start, stop = shard_range(len(paths), *shard) if shard else (0, len(paths))
+        for path in paths[start:stop]:
+            yield json.loads(path.read_text(encoding="utf-8"))
+        return
+    with NdjsonCatalog(source) as catalog:
+        start, stop = shard_range(len(catalog), *shard) if shard else (0, len(catalog))
+        yield from catalog.records(start, stop)
+
+
+def chunked(records: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    iterator = iter(records)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_chunks(source: Path, size: int, shard: Optional[Tuple[int, int]] = None) -> Iterator[Chunk]:
+    if source.is_dir():
+        yield from chunked(iter_records(source, shard), size)
+        return
+    # Builds or validates the offset index once, before any worker opens the export
+    with NdjsonCatalog(source) as catalog:
+        start, stop = shard_range(len(catalog), *shard) if shard else (0, len(catalog))
+    for chunk_start in range(start, stop, size):
+        yield (chunk_start, min(chunk_start + size, stop))
+
+
+def _chunk_len(chunk: Chunk) -> int:
+    return chunk[1] - chunk[0] if isinstance(chunk, tuple) else len(chunk)
+
+
+def _init_worker(state_path: Optional[Path], full: bool, export: Optional[Path]) -> None:
+    # Template engine and agents are built once per worker, not once per product.
+    # The process pool already provides the parallelism, so nodes run inline.
+    global _worker_orchestrator, _worker_engine, _worker_catalog
+    store = FingerprintStore(state_path) if state_path is not None else None
+    _worker_orchestrator = Orchestrator(max_workers=1, store=store, full=full)
+    _worker_engine = build_engine()
+    _worker_catalog = NdjsonCatalog(export) if export is not None else None
+
+
+def _chunk_records(chunk: Chunk) -> List[Dict[str, Any]]:
+    if isinstance(chunk, tuple):
+        assert _worker_catalog is not None, "worker has no export mapped"
+        return list(_worker_catalog.records(*chunk))
+    return chunk
+
+
+def _render_chunk(chunk: Chunk) -> Tuple[Dict[str, str], int, int]:
+    # Pages are serialized in the worker so the parent only concatenates text.
+    assert _worker_orchestrator is not None, "worker was not initialized"
+    lines: Dict[str, List[str]] = {key: [] for key in PAGE_KEYS}
+    reused = recomputed = 0
+    for raw in _chunk_records(chunk):
+        result = _worker_orchestrator.run_record(raw)
+        for key in PAGE_KEYS:
+            lines[key].append(json.dumps(result[key], ensure_ascii=False) + "\n")
+        tracker = result.get("tracker")
+        if tracker is not None:
+            reused += tracker.reused
+            recomputed += tracker.recomputed
+    return {key: "".join(chunk_lines) for key, chunk_lines in lines.items()}, reused, recomputed
+
+
+def _render_columnar_chunk(chunk: Chunk) -> Tuple[Dict[str, str], int, int]:
+    assert _worker_engine is not None, "worker was not initialized"
+    columns = CatalogColumns.from_records(_chunk_records(chunk))
+    texts = {}
+    for key in COLUMNAR_PAGE_KEYS:
+        pages = render_columns(_worker_engine, key, columns, {"alternative": ALTERNATIVE})
+        texts[key] = "".join(json.dumps(page, ensure_ascii=False) + "\n" for page in pages)
+    return texts, 0, 0
+
+
+def run_catalog(
+    source: Path,
+    output_dir: Path,
+    workers: Optional[int] = None,
+    chunk_size: int = 256,
+    state_path: Optional[Path] = None,
+    full: bool = False,
+    columnar: bool = False,
+    shard: Optional[Tuple[int, int]] = None,
+) -> CatalogReport:
+    """Render every product in ``source`` and write pages to ``<page>.jsonl`` files.
+
+    Chunks are submitted with a bounded window so memory stays flat regardless of
+    catalog size, and results are written in input order. With ``state_path``,
+    only blocks that read a changed product field are recomputed. ``columnar``
+    builds product and comparison pages for each chunk in bulk from a column
+    store and skips FAQ pages. ``shard`` is ``(index, count)`` and limits the run
+    to one slice of the catalog, e.g. one machine's share of a large export.
+    """
+    if columnar and state_path is not None:
+        raise ValueError("Columnar mode rebuilds every block and does not use incremental state")
+    workers = workers or os.cpu_count() or 1
+    page_keys = COLUMNAR_PAGE_KEYS if columnar else PAGE_KEYS
+    render = _render_columnar_chunk if columnar else _render_chunk
+    output_dir.mkdir(parents=True, exist_ok=True)
+    sinks = {key: (output_dir / f"{key}.jsonl").open("w", encoding="utf-8") for key in page_keys}
+    products = reused = recomputed = 0
+    start = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(state_path, full, None if source.is_dir() else source),
+        ) as pool:
+            window: Deque[Tuple[int, Future]] = deque()
+
+            def drain_one() -> int:
+                nonlocal reused, recomputed
+                size, future = window.popleft()
+                texts, chunk_reused, chunk_recomputed = future.result()
+                for key, text in texts.items():
+                    sinks[key].write(text)
+                reused += chunk_reused
+                recomputed += chunk_recomputed
+                return size
+
+            for chunk in iter_chunks(source, chunk_size, shard):
+                window.append((_chunk_len(chunk), pool.submit(render, chunk)))
+                if len(window) >= workers * 2:
+                    products += drain_one()
+            while window:
+                products += drain_one()
+    finally:
+        for sink in sinks.values():
+            sink.close()
+    return CatalogReport(
+        products=products,
+        seconds=time.perf_counter() - start,
+        workers=workers,
+        chunk_size=chunk_size,
+        units_reused=reused,
+        units_recomputed=recomputed,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Render pages for a whole product catalog.")
+    parser.add_argument("source", type=Path, help="JSONL file or directory of product JSON files")
+    parser.add_argument("--output-dir", type=Path, default=Path("output") / "catalog")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=256)
+    parser.add_argument("--state", type=Path, default=None, help="fingerprint store for incremental runs")
+    parser.add_argument("--full", action="store_true", help="ignore stored state and recompute everything")
+    parser.add_argument(
+        "--columnar", action="store_true", help="bulk-build product and comparison pages only (no FAQ pages)"
+    )
+    parser.add_argument("--shard", default=None, help="render only slice INDEX/COUNT of the records, e.g. 2/8")
+    args = parser.parse_args()
+    shard = tuple(int(part) for part in args.shard.split("/")) if args.shard else None
+
+    report = run_catalog(
+        args.source,
+        args.output_dir,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        state_path=args.state,
+        full=args.full,
+        columnar=args.columnar,
+        shard=shard,
+    )
+    print(
+        f"Rendered {report.products} products in {report.seconds:.2f}s "
+        f"({report.products_per_sec:.1f} products/sec, {report.workers} workers, "
+        f"chunk size {report.chunk_size})"
+    )
+    if args.state is not None:
+        print(f"Blocks reused: {report.units_reused}, recomputed: {report.units_recomputed}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Memory-mapped NDJSON catalog exports with a persistent byte-offset index."""
+
+import json
+import mmap
+import os
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from src.agents.data_ingestion_agent import parse_product
+from src.models import Product
+
+# Index file layout: [export size, export mtime_ns, offset_0, ..., offset_n-1] as uint64
+_HEADER = 2
+
+
+def shard_range(count: int, shard: int, shards: int) -> Tuple[int, int]:
+    """Record range ``[start, stop)`` owned by ``shard`` out of ``shards`` equal slices."""
+    if not 0 <= shard < shards:
+        raise ValueError(f"Shard {shard} is outside 0..{shards - 1}")
+    return count * shard // shards, count * (shard + 1) // shards
+
+
+class NdjsonCatalog:
+    """Random-access view over a (possibly multi-gigabyte) NDJSON product export.
+
+    The export is memory-mapped rather than read, and the start offset of every
+    non-blank line is stored next to it in ``<export>.idx``. The index is rebuilt
+    only when the export's size or mtime changes, so workers that open the same
+    export can seek straight to their slice without scanning the file.
+    """
+
+    def __init__(self, path: Path, index_path: Optional[Path] = None) -> None:
+        self.path = path
+        self.index_path = index_path or path.with_name(path.name + ".idx")
+        self._file = path.open("rb")
+        stat = os.fstat(self._file.fileno())
+        self._size = stat.st_size
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self._size else None
+        self._offsets = self._load_index(stat.st_mtime_ns)
+
+    def _load_index(self, mtime_ns: int) -> array:
+        offsets = array("Q")
+        if self.index_path.exists():
+            with self.index_path.open("rb") as handle:
+                offsets.frombytes(handle.read())
+            if len(offsets) >= _HEADER and offsets[0] == self._size and offsets[1] == mtime_ns:
+                return offsets[_HEADER:]
+        offsets = self._build_index()
+        header = array("Q", [self._size, mtime_ns])
+        tmp_path = self.index_path.with_name(self.index_path.name + f".{os.getpid()}.tmp")
+        with tmp_path.open("wb") as handle:
+            header.tofile(handle)
+            offsets.tofile(handle)
+        os.replace(tmp_path, self.index_path)
+        return offsets
+
+    def _build_index(self) -> array:
+        offsets = array("Q")
+        if self._mmap is None:
+            return offsets
+        data = self._mmap
+        position = 0
+        while position < self._size:
+            end = data.find(b"\n", position)
+            if end == -1:
+                end = self._size
+            if data[position:end].strip():
+                offsets.append(position)
+            position = end + 1
+        return offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def _line(self, row: int) -> bytes:
+        start = self._offsets[row]
+        end = self._mmap.find(b"\n", start)
+        return self._mmap[start : self._size if end == -1 else end]
+
+    def __getitem__(self, row: int) -> Dict[str, Any]:
+        if row < 0:
+            row += len(self)
+        return json.loads(self._line(row))
+
+    def records(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Lazily decode raw records ``[start, stop)``; only one line is held at a time."""
+        stop = len(self) if stop is None else min(stop, len(self))
+        for row in range(start, stop):
+            yield json.loads(self._line(row))
+
+    def products(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Product]:
+        for raw in self.records(start, stop):
+            yield parse_product(raw)
+
+    def shard(self, shard: int, shards: int) -> Iterator[Dict[str, Any]]:
+        return self.records(*shard_range(len(self), shard, shards))
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+        self._file.close()
+
+    def __enter__(self) -> "NdjsonCatalog":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -0,0 +1,188 @@
+"""Columnar catalog representation and bulk block builders.
+
+Every product field is stored as a column. Fields with repeating values
+(concentration, skin types, ingredients, how-to-use text, side effects, price)
+are dictionary-encoded: distinct values are kept once and rows hold compact
+``array`` codes. Bulk builders compute each block once per distinct combination
+of the codes it reads and broadcast the result to every row sharing it, so
+catalog-wide work grows with the number of distinct values, not the row count.
+Blocks shared between rows are the same object and must be treated as read-only.
+"""
+
+from array import array
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Sequence
+
+from src import content_blocks
+from src.models import Product
+from src.template_engine import TemplateEngine
+
+ENCODED_FIELDS = (
+    "concentration",
+    "skin_type",
+    "key_ingredients",
+    "benefits",
+    "how_to_use",
+    "side_effects",
+    "price",
+)
+
+
+class DictionaryColumn:
+    """Column of distinct values plus one code per row."""
+
+    __slots__ = ("values", "codes", "_index")
+
+    def __init__(self) -> None:
+        self.values: List[Any] = []
+        self.codes = array("I")
+        self._index: Dict[Hashable, int] = {}
+
+    def append(self, value: Hashable) -> None:
+        code = self._index.get(value)
+        if code is None:
+            code = len(self.values)
+            self.values.append(value)
+            self._index[value] = code
+        self.codes.append(code)
+
+    def __getitem__(self, row: int) -> Any:
+        return self.values[self.codes[row]]
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+
+class CatalogColumns:
+    """Column store for a batch of products."""
+
+    def __init__(self) -> None:
+        self.name: List[str] = []
+        self.columns: Dict[str, DictionaryColumn] = {field: DictionaryColumn() for field in ENCODED_FIELDS}
+
+    def __len__(self) -> int:
+        return len(self.name)
+
+    def __getattr__(self, field: str) -> DictionaryColumn:
+        try:
+            return self.__dict__["columns"][field]
+        except KeyError:
+            raise AttributeError(field) from None
+
+    def append_product(self, product: Product) -> None:
+        self.name.append(product.name)
+        for field in ENCODED_FIELDS:
+            self.columns[field].append(getattr(product, field))
+
+    def append_record(self, raw: Dict[str, Any]) -> None:
+        """Append a raw export record (``product_name`` schema) without building a Product."""
+        self.name.append(raw["product_name"])
+        for field in ENCODED_FIELDS:
+            value = raw[field]
+            self.columns[field].append(tuple(value) if isinstance(value, list) else value)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> "CatalogColumns":
+        columns = cls()
+        for raw in records:
+            columns.append_record(raw)
+        return columns
+
+    @classmethod
+    def from_products(cls, products: Iterable[Product]) -> "CatalogColumns":
+        columns = cls()
+        for product in products:
+            columns.append_product(product)
+        return columns
+
+    def product(self, row: int) -> Product:
+        return Product(name=self.name[row], **{field: self.columns[field][row] for field in ENCODED_FIELDS})
+
+
+def _broadcast(keys: Iterable[Hashable], compute: Callable[[Hashable], Any]) -> List[Any]:
+    memo: Dict[Hashable, Any] = {}
+    out = []
+    for key in keys:
+        value = memo.get(key)
+        if value is None:
+            value = memo[key] = compute(key)
+        out.append(value)
+    return out
+
+
+def taglines(columns: CatalogColumns) -> List[str]:
+    concentration, skin_type = columns.concentration, columns.skin_type
+    return _broadcast(
+        zip(concentration.codes, skin_type.codes),
+        lambda key: content_blocks.build_tagline(concentration.values[key[0]], skin_type.values[key[1]]),
+    )
+
+
+def core_summaries(columns: CatalogColumns, context: Optional[Dict[str, Any]] = None) -> List[Dict[str, str]]:
+    prices = columns.price
+    return [
+        {"name": name, "tagline": tagline, "price": prices.values[code]}
+        for name, tagline, code in zip(columns.name, taglines(columns), prices.codes)
+    ]
+
+
+def _per_code(fields: Sequence[str], block: Callable[[Any], Any]) -> Callable[..., List[Any]]:
+    """Lift a single-product block that reads only ``fields`` into a bulk builder."""
+
+    def build(columns: CatalogColumns, context: Optional[Dict[str, Any]] = None) -> List[Any]:
+        encoded = [columns.columns[field] for field in fields]
+        return _broadcast(
+            zip(*(column.codes for column in encoded)),
+            lambda key: block(
+                SimpleNamespace(**{field: column.values[code] for field, column, code in zip(fields, encoded, key)})
+            ),
+        )
+
+    return build
+
+
+benefits_blocks = _per_code(("benefits", "skin_type"), content_blocks.build_benefits_block)
+ingredient_blocks = _per_code(("key_ingredients",), content_blocks.build_ingredient_block)
+usage_blocks = _per_code(("how_to_use",), content_blocks.build_usage_block)
+safety_blocks = _per_code(("side_effects",), content_blocks.build_safety_block)
+
+
+def comparison_blocks(columns: CatalogColumns, context: Dict[str, Any]) -> List[Dict[str, Any]]:
+    # The primary side includes the product name, which is unique per row
+    alternative = context["alternative"]
+    return [content_blocks.build_comparison(columns.product(row), alternative) for row in range(len(columns))]
+
+
+BULK_BUILDERS: Dict[str, Callable[..., List[Any]]] = {
+    "product_page.summary": core_summaries,
+    "product_page.benefits": benefits_blocks,
+    "product_page.ingredients": ingredient_blocks,
+    "product_page.usage": usage_blocks,
+    "product_page.safety": safety_blocks,
+    "comparison_page.comparison": comparison_blocks,
+}
+
+
+def render_columns(
+    engine: TemplateEngine,
+    template_name: str,
+    columns: CatalogColumns,
+    context: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    """Render one page per row, building every non-constant field with its bulk builder."""
+    template = engine.registry.get(template_name)
+    names: List[str] = ["template"]
+    field_columns: List[Sequence[Any]] = []
+    for template_field in template.fields:
+        if template_field.constant:
+            values: Sequence[Any] = [template_field.resolver({})] * len(columns)
+        else:
+            key = f"{template_name}.{template_field.name}"
+            if key not in BULK_BUILDERS:
+                raise KeyError(f"No bulk builder for template field '{key}'")
+            values = BULK_BUILDERS[key](columns, context or {})
+        if template_field.select is not None:
+            values = [value[template_field.select] for value in values]
+        names.append(template_field.name)
+        field_columns.append(values)
+    return [dict(zip(names, (template.name, *row))) for row in zip(*field_columns)]
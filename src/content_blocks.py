@@ -1,15 +1,20 @@
 """Reusable content logic blocks that transform structured product data."""
 
-from typing import Dict, List
+from typing import Dict, List, Sequence
 
 from src.models import Product
 
 
+def build_tagline(concentration: str, skin_type: Sequence[str]) -> str:
+    """One-line positioning statement shared by single and bulk summary builders."""
+    return f"{concentration} serum formulated for {', '.join(skin_type)} skin."
+
+
 def build_core_summary(product: Product) -> Dict[str, str]:
     """High-level summary block."""
     return {
         "name": product.name,
-        "tagline": f"{product.concentration} serum formulated for {', '.join(product.skin_type)} skin.",
+        "tagline": build_tagline(product.concentration, product.skin_type),
         "price": product.price,
     }
 
@@ -0,0 +1,125 @@
+"""Field-level dependency tracking for incremental page regeneration.
+
+Every unit of work (a template field, the question set, one FAQ answer) runs
+against a ``FieldRecorder`` that notes which ``Product`` fields it reads. The
+reads, the unit's output and a fingerprint of every field are stored per product.
+On the next run a unit is recomputed only if one of the fields it read changed.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from dataclasses import fields
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Set, TypeVar
+
+from src.models import Product
+
+T = TypeVar("T")
+
+PRODUCT_FIELDS = tuple(f.name for f in fields(Product))
+
+
+def fingerprint(product: Product) -> Dict[str, str]:
+    """Stable hash of every Product field."""
+    return {
+        name: hashlib.sha1(
+            json.dumps(getattr(product, name), ensure_ascii=False, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+        for name in PRODUCT_FIELDS
+    }
+
+
+class FieldRecorder:
+    """Read-only Product stand-in that records which fields are accessed."""
+
+    __slots__ = ("_product", "_reads")
+
+    def __init__(self, product: Product, reads: Set[str]) -> None:
+        self._product = product
+        self._reads = reads
+
+    def __getattr__(self, name: str) -> Any:
+        self._reads.add(name)
+        return getattr(self._product, name)
+
+
+class FingerprintStore:
+    """SQLite-backed store of the previous run's fingerprints, reads and outputs per product."""
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS products (key TEXT PRIMARY KEY, entry TEXT NOT NULL)")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT entry FROM products WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, key: str, entry: Dict[str, Any]) -> None:
+        value = json.dumps(entry, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO products (key, entry) VALUES (?, ?)", (key, value))
+
+
+class DependencyTracker:
+    """Per-run view of one product's previous state; lives in the graph payload.
+
+    Only reads of the primary product are tracked, so units must not depend on
+    other inputs that can change between runs. Pass ``full=True`` after editing
+    block or template code to ignore the stored outputs.
+    """
+
+    def __init__(self, store: FingerprintStore, full: bool = False) -> None:
+        self.store = store
+        self.full = full
+        self.key: Optional[str] = None
+        self.fields: Dict[str, str] = {}
+        self.changed: Optional[Set[str]] = None
+        self.units: Dict[str, Dict[str, Any]] = {}
+        self.reused = 0
+        self.recomputed = 0
+        self._previous_units: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, product: Product) -> None:
+        """Load the previous entry for ``product`` and diff its field fingerprints."""
+        self.key = product.name
+        self.fields = fingerprint(product)
+        previous = None if self.full else self.store.get(self.key)
+        if previous is None:
+            return
+        self._previous_units = previous["units"]
+        old = previous["fields"]
+        self.changed = {name for name, digest in self.fields.items() if old.get(name) != digest}
+
+    def compute(self, unit: str, fn: Callable[[Any], T], product: Product) -> T:
+        """Return ``fn(product)``, reusing the previous output if none of its reads changed."""
+        previous = self._previous_units.get(unit)
+        if self.changed is not None and previous is not None and not self.changed & set(previous["reads"]):
+            with self._lock:
+                self.units[unit] = previous
+                self.reused += 1
+            return previous["output"]
+        reads: Set[str] = set()
+        output = fn(FieldRecorder(product, reads))
+        with self._lock:
+            self.units[unit] = {"reads": sorted(reads), "output": output}
+            self.recomputed += 1
+        return output
+
+    def commit(self) -> None:
+        if self.key is not None:
+            self.store.put(self.key, {"fields": self.fields, "units": self.units})
+
+
+def tracked(tracker: Optional[DependencyTracker], unit: str, fn: Callable[[Any], T], product: Product) -> T:
+    """Run ``fn`` through ``tracker`` when one is configured, otherwise call it directly."""
+    if tracker is None:
+        return fn(product)
+    return tracker.compute(unit, fn, product)
@@ -0,0 +1,165 @@
+"""Incremental JSON parsing and writing for streamed LLM output."""
+
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, TextIO, Tuple
+
+_CLOSERS = {"[": "]", "{": "}"}
+# An opening bracket followed by a JSON value, member or closer, not a prose word
+_VALUE_START = re.compile(r'[\[{]\s*(?:["{\[\]}\-0-9]|true\b|false\b|null\b)')
+
+
+def _drop_trailing_comma(out: List[str]) -> None:
+    index = len(out) - 1
+    while index >= 0 and out[index].isspace():
+        index -= 1
+    if index >= 0 and out[index] == ",":
+        del out[index:]
+
+
+def extract_json(text: str) -> Any:
+    """Parse the first JSON object or array in ``text``, with light repair.
+
+    Prose and code fences around the value are skipped, trailing commas are
+    dropped, a mismatched closing bracket is read as the expected one, and a
+    truncated value is closed, or if that does not parse, cut back to its last
+    complete member first. Brackets in the prose before the value (``{name}``)
+    are skipped without parsing: the value starts at the first ``{`` or ``[``
+    followed by something JSON can start with. Only that candidate is scanned,
+    once; a value nested in it is never returned in its place. Raises
+    ``ValueError`` when nothing parseable is found.
+    """
+    match = _VALUE_START.search(text)
+    if match is None:
+        raise ValueError("No JSON object or array in text")
+    return _parse_from(text, match.start())
+
+
+def _parse_from(text: str, start: int) -> Any:
+    """The JSON value opening at ``text[start]``, repaired as described in ``extract_json``."""
+    out: List[str] = []
+    stack: List[str] = []
+    # Where to cut a truncated value: output length and open brackets after the last complete member
+    safe: Tuple[int, Tuple[str, ...]] = (0, ())
+    in_string = escaped = False
+    for char in text[start:]:
+        if in_string:
+            out.append(char)
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+            continue
+        if char == '"':
+            in_string = True
+            out.append(char)
+        elif char in _CLOSERS:
+            stack.append(_CLOSERS[char])
+            out.append(char)
+        elif char in "]}":
+            _drop_trailing_comma(out)
+            out.append(stack.pop())
+            if not stack:
+                break
+            safe = (len(out), tuple(stack))
+        elif char == ",":
+            safe = (len(out), tuple(stack))
+            out.append(char)
+        else:
+            out.append(char)
+    if stack:
+        if not in_string:
+            closed = out[:]
+            _drop_trailing_comma(closed)
+            try:
+                return json.loads("".join(closed + stack[::-1]))
+            except json.JSONDecodeError:
+                pass
+        length, open_brackets = safe
+        del out[length:]
+        _drop_trailing_comma(out)
+        out.extend(reversed(open_brackets))
+    return json.loads("".join(out))
+
+
+class JsonArrayStream:
+    """Emits each object or array element of a top-level JSON array once complete.
+
+    Text before the opening ``[`` (prose, a ```json fence, even one with braces)
+    and after the closing ``]`` is ignored. Only the element currently being scanned is buffered, so
+    memory is bounded by the largest element rather than the whole response. Each element is
+    parsed on its own: one that does not parse is emitted as ``None`` and the next ones are
+    unaffected. An element left open when the text ends is never emitted.
+    """
+
+    def __init__(self) -> None:
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.closed = False
+        self._element: List[str] = []
+
+    def feed(self, text: str) -> List[Any]:
+        """Consume a chunk of text and return the elements it completed."""
+        completed: List[Any] = []
+        for char in text:
+            if self.closed:
+                break
+            if not self.depth:
+                # Nothing before the array opens is JSON, brackets in prose included
+                if char == "[":
+                    self.depth = 1
+                continue
+            if self.depth >= 2:
+                self._element.append(char)
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+                continue
+            if char == '"':
+                self.in_string = True
+            elif char in "[{":
+                self.depth += 1
+                if self.depth == 2:
+                    self._element = [char]
+            elif char in "]}":
+                self.depth -= 1
+                if self.depth == 1:
+                    try:
+                        completed.append(_parse_from("".join(self._element), 0))
+                    except ValueError:
+                        completed.append(None)
+                    self._element = []
+                elif self.depth == 0:
+                    self.closed = True
+        return completed
+
+
+class NdjsonSink:
+    """Appends one JSON object per line and flushes so readers see each record at once."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._handle: Optional[TextIO] = None
+
+    def __enter__(self) -> "NdjsonSink":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._handle = self.path.open("w", encoding="utf-8")
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    def write(self, record: Dict[str, Any]) -> None:
+        assert self._handle is not None, "sink is not open"
+        self._handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._handle.flush()
@@ -0,0 +1,147 @@
+"""Process-wide registry of chat model clients.
+
+Every agent asks ``chat_model`` for its model instead of constructing one, and
+gets a shared instance per (model class, model, settings): all agents and all
+products in a process use the same few clients. OpenAI clients are given one
+shared keep-alive HTTP connection pool (sync, plus one async pool per event
+loop), so a catalog run reuses a handful of TLS connections instead of opening
+one set per agent.
+
+    configure_clients(max_connections=32, models={"gpt-4o-mini": {"timeout": 30}})
+"""
+
+import asyncio
+import threading
+import weakref
+from typing import Any, Dict, Optional, Tuple
+
+# Settings applied to every model of that name, under the agent's own arguments,
+# e.g. {"gpt-4o-mini": {"timeout": 30, "max_tokens": 1024}}
+DEFAULT_MODEL_SETTINGS: Dict[str, Dict[str, Any]] = {}
+
+
+class ClientRegistry:
+    """Shared HTTP pools and chat model instances; see the module docstring."""
+
+    def __init__(
+        self,
+        max_connections: int = 20,
+        max_keepalive_connections: Optional[int] = None,
+        keepalive_expiry: float = 90.0,
+        models: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> None:
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections or max_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.models = {**DEFAULT_MODEL_SETTINGS, **(models or {})}
+        self.model_class: Optional[type] = None
+        self._http_client: Any = None
+        # Async pools are bound to the loop that opened their connections
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+        self._instances: Dict[Tuple[Any, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def _limits(self) -> Any:
+        import httpx
+
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    def http_client(self) -> Any:
+        with self._lock:
+            if self._http_client is None:
+                import httpx
+
+                self._http_client = httpx.Client(limits=self._limits())
+            return self._http_client
+
+    def async_http_client(self) -> Optional[Any]:
+        """Pool for the running event loop; None outside one (the model then builds its own on demand)."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+        with self._lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                import httpx
+
+                client = self._async_clients[loop] = httpx.AsyncClient(limits=self._limits())
+            return client
+
+    def chat_model(self, model: str = "gpt-4o-mini", **kwargs: Any) -> Any:
+        """Shared scheduled chat model for ``model`` with per-model settings under ``kwargs``."""
+        from src.llm_scheduler import scheduled
+
+        if self.model_class is None:
+            from langchain_openai import ChatOpenAI
+
+            self.model_class = ChatOpenAI
+        model_cls = scheduled(self.model_class)
+        settings = {**self.models.get(model, {}), **kwargs}
+        pooled = "http_client" in getattr(model_cls, "model_fields", {})
+        loop_client = self.async_http_client() if pooled else None
+        key = (model_cls, model, id(loop_client), tuple(sorted((name, repr(value)) for name, value in settings.items())))
+        with self._lock:
+            instance = self._instances.get(key)
+        if instance is not None:
+            return instance
+        if pooled:
+            settings["http_client"] = self.http_client()
+            if loop_client is not None:
+                settings["http_async_client"] = loop_client
+        # Rate limits and retries (429s, timeouts, connection errors, 5xx) are the shared scheduler's
+        instance = model_cls(model=model, max_retries=0, **settings)
+        with self._lock:
+            return self._instances.setdefault(key, instance)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"models": len(self._instances), "async_pools": len(self._async_clients)}
+
+
+_registry: Optional[ClientRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def configure_clients(**kwargs: Any) -> ClientRegistry:
+    """Replace the process-wide registry (see ``ClientRegistry`` for the options)."""
+    global _registry
+    with _registry_lock:
+        model_class = _registry.model_class if _registry is not None else None
+        _registry = ClientRegistry(**kwargs)
+        _registry.model_class = model_class
+        return _registry
+
+
+def get_registry() -> ClientRegistry:
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ClientRegistry()
+        return _registry
+
+
+def use_chat_model(model_cls: type) -> None:
+    """Build models from now on with ``model_cls`` (same constructor arguments as ChatOpenAI)."""
+    registry = get_registry()
+    with registry._lock:
+        registry.model_class = model_cls
+        registry._instances.clear()
+
+
+def chat_model(model: str = "gpt-4o-mini", **kwargs: Any) -> Any:
+    return get_registry().chat_model(model, **kwargs)
+
+
+def json_mode(llm: Any) -> Any:
+    """``llm`` bound to the provider's JSON-object response mode, where the provider has one.
+
+    Only for prompts whose reply is a single JSON object (and that mention JSON).
+    """
+    if "openai" in getattr(llm, "_llm_type", ""):
+        return llm.bind(response_format={"type": "json_object"})
+    return llm
@@ -0,0 +1,422 @@
+"""Process-wide scheduler for LLM API calls.
+
+Every chat model built with ``scheduled`` sends its requests through one shared
+``LLMScheduler``, which enforces:
+
+* token buckets for requests/min and tokens/min, sized to the account limits;
+* an AIMD concurrency limit: each success adds ``1 / limit`` (about +1 per round
+  of in-flight calls), a 429 halves it and latency above ``target_latency``
+  trims it by 10%;
+* coordinated backoff: a 429 seen by any agent pauses every caller until the
+  ``Retry-After`` (or exponential) deadline, and the call is then retried here
+  instead of inside each client;
+* transient failures (timeouts, connection errors, 5xx) are retried with
+  exponential backoff for that call only, as the OpenAI client itself would.
+
+Cache hits never reach ``_generate`` and so do not consume capacity.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, Optional, TypeVar
+
+from langchain_core.language_models.chat_models import BaseChatModel
+
+from src.token_usage import count_message_tokens
+
+T = TypeVar("T")
+
+# Expected completion size when the model has no max_tokens set
+DEFAULT_COMPLETION_TOKENS = 512
+# How long a caller waits before re-checking a full concurrency limit
+_POLL_SECONDS = 0.02
+
+
+class TokenBucket:
+    """Refills continuously at ``per_minute / 60`` units per second, up to ``burst_seconds`` worth."""
+
+    def __init__(self, per_minute: float, burst_seconds: float = 10.0) -> None:
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, self.rate * burst_seconds)
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until ``amount`` is available; 0 if it can be taken now."""
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+        # A single request larger than the bucket waits for a full bucket instead of forever
+        amount = min(amount, self.capacity)
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+    def take(self, amount: float) -> None:
+        self.level -= amount
+
+    def give(self, amount: float) -> None:
+        self.level = min(self.capacity, self.level + amount)
+
+
+def is_rate_limit(exc: BaseException) -> bool:
+    """True for HTTP 429 errors from the OpenAI client (or anything shaped like them)."""
+    return getattr(exc, "status_code", None) == 429 or type(exc).__name__ == "RateLimitError"
+
+
+# Errors the OpenAI client retries by default; matched by name so other providers' clients fit too
+_TRANSIENT_ERRORS = ("APIConnectionError", "APITimeoutError", "InternalServerError")
+
+
+def is_transient(exc: BaseException) -> bool:
+    """True for timeouts, connection errors and 408/409/5xx responses."""
+    status = getattr(exc, "status_code", None)
+    if isinstance(status, int) and (status in (408, 409) or status >= 500):
+        return True
+    return any(cls.__name__ in _TRANSIENT_ERRORS for cls in type(exc).__mro__)
+
+
+def retry_after(exc: BaseException) -> Optional[float]:
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class LLMScheduler:
+    """Admission control shared by all agents; see the module docstring."""
+
+    def __init__(
+        self,
+        requests_per_minute: float = 500,
+        tokens_per_minute: float = 200_000,
+        concurrency: int = 8,
+        min_concurrency: int = 1,
+        max_concurrency: int = 64,
+        target_latency: Optional[float] = None,
+        max_attempts: int = 6,
+        base_backoff: float = 1.0,
+        max_backoff: float = 60.0,
+        burst_seconds: float = 10.0,
+    ) -> None:
+        self.requests = TokenBucket(requests_per_minute, burst_seconds)
+        self.tokens = TokenBucket(tokens_per_minute, burst_seconds)
+        self.limit = float(concurrency)
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.target_latency = target_latency
+        self.max_attempts = max_attempts
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.in_flight = 0
+        self.calls = 0
+        self.rate_limited = 0
+        self.retries = 0
+        self._resume_at = 0.0
+        self._consecutive_limits = 0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    def _try_acquire(self, tokens: float) -> float:
+        # Caller holds the lock; returns 0 once a slot and both budgets are taken
+        now = time.monotonic()
+        if now < self._resume_at:
+            return self._resume_at - now
+        if self.in_flight >= int(self.limit):
+            return _POLL_SECONDS
+        wait = max(self.requests.wait_time(1, now), self.tokens.wait_time(tokens, now))
+        if wait:
+            return wait
+        self.requests.take(1)
+        self.tokens.take(tokens)
+        self.in_flight += 1
+        self.calls += 1
+        return 0.0
+
+    def acquire(self, tokens: float) -> None:
+        with self._cond:
+            while True:
+                wait = self._try_acquire(tokens)
+                if not wait:
+                    return
+                self._cond.wait(wait)
+
+    async def aacquire(self, tokens: float) -> None:
+        while True:
+            with self._cond:
+                wait = self._try_acquire(tokens)
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+    def release(self) -> None:
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+    def settle(self, estimated: float, actual: Optional[float]) -> None:
+        """Correct the token bucket once the provider reports actual usage."""
+        if actual is None:
+            return
+        with self._cond:
+            if actual > estimated:
+                self.tokens.take(actual - estimated)
+            else:
+                self.tokens.give(estimated - actual)
+
+    def _decrease(self, factor: float) -> None:
+        now = time.monotonic()
+        # One decrease per congestion event, not one per in-flight call that observed it
+        if now - self._last_decrease < self.base_backoff:
+            return
+        self._last_decrease = now
+        self.limit = max(self.min_concurrency, self.limit * factor)
+
+    def on_success(self, latency: float) -> None:
+        with self._cond:
+            self._consecutive_limits = 0
+            if self.target_latency is not None and latency > self.target_latency:
+                self._decrease(0.9)
+            else:
+                self.limit = min(self.max_concurrency, self.limit + 1.0 / self.limit)
+
+    def on_rate_limit(self, delay: Optional[float] = None) -> None:
+        with self._cond:
+            self.rate_limited += 1
+            self._consecutive_limits += 1
+            if delay is None:
+                delay = min(self.max_backoff, self.base_backoff * 2 ** (self._consecutive_limits - 1))
+            # Jitter so paused callers do not all resume on the same tick
+            delay *= 1 + 0.1 * random.random()
+            self._resume_at = max(self._resume_at, time.monotonic() + delay)
+            self._decrease(0.5)
+
+    def _retry_delay(self, exc: BaseException, attempt: int, stats: Optional[Dict[str, float]]) -> Optional[float]:
+        """Seconds this caller waits before retrying ``exc``, or None to raise it."""
+        if attempt >= self.max_attempts:
+            return None
+        if is_rate_limit(exc):
+            # The shared pause is enforced on admission
+            self.on_rate_limit(retry_after(exc))
+            delay = 0.0
+        elif is_transient(exc):
+            delay = retry_after(exc)
+            if delay is None:
+                delay = min(self.max_backoff, self.base_backoff * 2 ** (attempt - 1)) * (1 + 0.1 * random.random())
+        else:
+            return None
+        with self._cond:
+            self.retries += 1
+        if stats is not None:
+            stats["retries"] = attempt
+        return delay
+
+    @staticmethod
+    def _note_wait(stats: Optional[Dict[str, float]], queued: float, started: float) -> None:
+        if stats is not None:
+            stats["queue_wait"] = stats.get("queue_wait", 0.0) + started - queued
+
+    def call(self, fn: Callable[[], T], tokens: float, stats: Optional[Dict[str, float]] = None) -> T:
+        """Run ``fn`` once admitted, retrying rate-limited and transiently failed attempts.
+
+        ``stats``, if given, receives the total ``queue_wait`` and the number of ``retries``.
+        """
+        attempt = 0
+        delay: Optional[float] = 0.0
+        while True:
+            attempt += 1
+            if delay:
+                time.sleep(delay)
+            queued = time.monotonic()
+            self.acquire(tokens)
+            started = time.monotonic()
+            self._note_wait(stats, queued, started)
+            try:
+                result = fn()
+            except Exception as exc:
+                delay = self._retry_delay(exc, attempt, stats)
+                if delay is not None:
+                    continue
+                raise
+            finally:
+                self.release()
+            self.on_success(time.monotonic() - started)
+            return result
+
+    async def acall(self, fn: Callable[[], Any], tokens: float, stats: Optional[Dict[str, float]] = None) -> Any:
+        """Async variant of call; ``fn`` returns an awaitable."""
+        attempt = 0
+        delay: Optional[float] = 0.0
+        while True:
+            attempt += 1
+            if delay:
+                await asyncio.sleep(delay)
+            queued = time.monotonic()
+            await self.aacquire(tokens)
+            started = time.monotonic()
+            self._note_wait(stats, queued, started)
+            try:
+                result = await fn()
+            except Exception as exc:
+                delay = self._retry_delay(exc, attempt, stats)
+                if delay is not None:
+                    continue
+                raise
+            finally:
+                self.release()
+            self.on_success(time.monotonic() - started)
+            return result
+
+    def stream(self, make_iter: Callable[[], Iterator[T]], tokens: float) -> Iterator[T]:
+        """Hold one slot for a whole stream; only retried if nothing was yielded yet."""
+        attempt = 0
+        delay: Optional[float] = 0.0
+        while True:
+            attempt += 1
+            if delay:
+                time.sleep(delay)
+            self.acquire(tokens)
+            started = time.monotonic()
+            yielded = False
+            try:
+                for item in make_iter():
+                    yielded = True
+                    yield item
+            except Exception as exc:
+                delay = None if yielded else self._retry_delay(exc, attempt, None)
+                if delay is not None:
+                    continue
+                raise
+            finally:
+                self.release()
+            self.on_success(time.monotonic() - started)
+            return
+
+    async def astream(self, make_iter: Callable[[], AsyncIterator[T]], tokens: float) -> AsyncIterator[T]:
+        """Async variant of stream."""
+        attempt = 0
+        delay: Optional[float] = 0.0
+        while True:
+            attempt += 1
+            if delay:
+                await asyncio.sleep(delay)
+            await self.aacquire(tokens)
+            started = time.monotonic()
+            yielded = False
+            try:
+                async for item in make_iter():
+                    yielded = True
+                    yield item
+            except Exception as exc:
+                delay = None if yielded else self._retry_delay(exc, attempt, None)
+                if delay is not None:
+                    continue
+                raise
+            finally:
+                self.release()
+            self.on_success(time.monotonic() - started)
+            return
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "calls": self.calls,
+                "retries": self.retries,
+                "rate_limited": self.rate_limited,
+                "in_flight": self.in_flight,
+                "concurrency_limit": round(self.limit, 2),
+            }
+
+
+_scheduler: Optional[LLMScheduler] = None
+_scheduler_lock = threading.Lock()
+_scheduled_classes: Dict[type, type] = {}
+
+
+def configure_scheduler(**kwargs: Any) -> LLMScheduler:
+    """Replace the process-wide scheduler (see ``LLMScheduler`` for the options)."""
+    global _scheduler
+    with _scheduler_lock:
+        _scheduler = LLMScheduler(**kwargs)
+        return _scheduler
+
+
+def get_scheduler() -> LLMScheduler:
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = LLMScheduler()
+        return _scheduler
+
+
+def _estimate_tokens(model: Any, messages: Any) -> int:
+    name = getattr(model, "model_name", None) or "gpt-4o-mini"
+    completion = getattr(model, "max_tokens", None) or DEFAULT_COMPLETION_TOKENS
+    return count_message_tokens(messages, name) + completion
+
+
+def _stamp(result: Any, stats: Dict[str, float]) -> None:
+    # Exposes queue wait and retries to callbacks through each generation's info
+    for generation in result.generations:
+        generation.generation_info = {**(generation.generation_info or {}), **stats}
+
+
+def _reported_tokens(result: Any) -> Optional[int]:
+    usage = (getattr(result, "llm_output", None) or {}).get("token_usage") or {}
+    return usage.get("total_tokens")
+
+
+def scheduled(model_cls: type) -> type:
+    """Subclass of a chat model class whose API calls go through the shared scheduler."""
+    if model_cls in _scheduled_classes:
+        return _scheduled_classes[model_cls]
+
+    class Scheduled(model_cls):  # type: ignore[misc, valid-type]
+        def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+            scheduler = get_scheduler()
+            tokens = _estimate_tokens(self, messages)
+            stats: Dict[str, float] = {}
+            result = scheduler.call(
+                lambda: super(Scheduled, self)._generate(messages, stop=stop, run_manager=run_manager, **kwargs),
+                tokens,
+                stats,
+            )
+            scheduler.settle(tokens, _reported_tokens(result))
+            _stamp(result, stats)
+            return result
+
+        async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+            scheduler = get_scheduler()
+            tokens = _estimate_tokens(self, messages)
+            stats: Dict[str, float] = {}
+            result = await scheduler.acall(
+                lambda: super(Scheduled, self)._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs),
+                tokens,
+                stats,
+            )
+            scheduler.settle(tokens, _reported_tokens(result))
+            _stamp(result, stats)
+            return result
+
+        def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+            return get_scheduler().stream(
+                lambda: super(Scheduled, self)._stream(messages, stop=stop, run_manager=run_manager, **kwargs),
+                _estimate_tokens(self, messages),
+            )
+
+        def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+            return get_scheduler().astream(
+                lambda: super(Scheduled, self)._astream(messages, stop=stop, run_manager=run_manager, **kwargs),
+                _estimate_tokens(self, messages),
+            )
+
+    # BaseChatModel's defaults delegate to _generate/_stream, which are already scheduled;
+    # wrapping them too would take two slots per call
+    for name in ("_agenerate", "_stream", "_astream"):
+        if getattr(model_cls, name) is getattr(BaseChatModel, name):
+            delattr(Scheduled, name)
+
+    Scheduled.__name__ = Scheduled.__qualname__ = f"Scheduled{model_cls.__name__}"
+    _scheduled_classes[model_cls] = Scheduled
+    return Scheduled
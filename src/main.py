@@ -1,16 +1,31 @@
 """Main entry point for the LangChain-based agentic content generation system."""
 
+import argparse
+import asyncio
 import json
 import os
 from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional
 
 from dotenv import load_dotenv
 
-from src.workflow import build_workflow
+from src.answer_reuse import AnswerReuseCache
+from src.workflow import build_workflow, product_input
+
+# LangChain and LangGraph modules are imported where a run needs them, so
+# `python -m src.main --help` and importing this module stay fast
+if TYPE_CHECKING:
+    from src.checkpoint_store import SqliteCheckpointSaver
+    from src.metrics_callback import MetricsCallback
 
 # Load environment variables for API keys
 load_dotenv()
 
+BASE_DIR = Path(__file__).resolve().parent.parent
+LLM_CACHE_PATH = BASE_DIR / ".cache" / "llm_cache.sqlite"
+ANSWER_CACHE_PATH = BASE_DIR / ".cache" / "faq_answers.sqlite"
+CHECKPOINT_PATH = BASE_DIR / ".cache" / "checkpoints.sqlite"
+
 
 def write_json(path: Path, payload) -> None:
     """Write payload as formatted JSON to file."""
@@ -18,37 +33,220 @@ def write_json(path: Path, payload) -> None:
     path.write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8")
 
 
-def run_pipeline() -> None:
-    """Execute the LangGraph workflow to generate all content pages."""
-    base_dir = Path(__file__).resolve().parent.parent
-    data_path = base_dir / "data" / "product_data.json"
-    output_dir = base_dir / "output"
+def write_pages(final_state: Dict[str, Any], output_dir: Path, faq_sink: Optional[Path] = None) -> None:
+    """Write every rendered page present in the final workflow state.
+
+    A streamed FAQ sink holds entries in the order FAQ chunks finished them; it is
+    removed once ``faq.json`` is written from the state, in question order.
+    """
+    if "faq_page" in final_state and final_state["faq_page"]:
+        write_json(output_dir / "faq.json", final_state["faq_page"])
+        if faq_sink is not None and faq_sink.exists():
+            faq_sink.unlink()
+
+    if "product_page" in final_state and final_state["product_page"]:
+        write_json(output_dir / "product_page.json", final_state["product_page"])
+
+    if "comparison_page" in final_state and final_state["comparison_page"]:
+        write_json(output_dir / "comparison_page.json", final_state["comparison_page"])
+
+
+def write_metrics(usage: "MetricsCallback", output_dir: Path) -> None:
+    """Write token totals, Prometheus metrics and the Chrome trace for a run."""
+    write_json(output_dir / "token_usage.json", usage.report())
+    usage.metrics.write_prometheus(output_dir / "metrics.prom")
+    usage.metrics.write_chrome_trace(output_dir / "trace.json")
 
+
+def _require_api_key() -> None:
     # Check for OpenAI API key
     if not os.getenv("OPENAI_API_KEY"):
         raise ValueError(
             "OPENAI_API_KEY not found. Please set it in your environment or .env file."
         )
 
+
+def _configure_cache() -> None:
+    # Set LLM_CACHE=0 to force fresh completions for every call
+    if os.getenv("LLM_CACHE", "1") != "0":
+        from src.llm_cache import enable_llm_cache
+
+        enable_llm_cache(Path(os.getenv("LLM_CACHE_PATH", LLM_CACHE_PATH)))
+
+
+def _configure_scheduler() -> None:
+    from src.llm_scheduler import configure_scheduler
+
+    # Account limits shared by every agent in this process; unset values keep the defaults
+    limits = {
+        "requests_per_minute": os.getenv("LLM_RPM"),
+        "tokens_per_minute": os.getenv("LLM_TPM"),
+        "concurrency": os.getenv("LLM_CONCURRENCY"),
+        "target_latency": os.getenv("LLM_TARGET_LATENCY"),
+    }
+    configure_scheduler(
+        **{key: int(value) if key == "concurrency" else float(value) for key, value in limits.items() if value}
+    )
+
+
+def _configure_clients() -> None:
+    from src.llm_clients import configure_clients
+
+    # LLM_POOL_SIZE caps the shared HTTP connection pool; LLM_MODEL_SETTINGS is a JSON object
+    # of per-model constructor settings, e.g. {"gpt-4o-mini": {"timeout": 30}}
+    configure_clients(
+        max_connections=int(os.getenv("LLM_POOL_SIZE", "20")),
+        models=json.loads(os.getenv("LLM_MODEL_SETTINGS", "{}")),
+    )
+
+
+def _answer_cache(reuse_answers: bool) -> Optional[AnswerReuseCache]:
+    return AnswerReuseCache(Path(os.getenv("ANSWER_CACHE_PATH", ANSWER_CACHE_PATH))) if reuse_answers else None
+
+
+def _metrics_callback() -> "MetricsCallback":
+    from src.metrics_callback import MetricsCallback
+
+    return MetricsCallback()
+
+
+def _checkpointer() -> "SqliteCheckpointSaver":
+    from src.checkpoint_store import SqliteCheckpointSaver
+
+    return SqliteCheckpointSaver(Path(os.getenv("CHECKPOINT_PATH", CHECKPOINT_PATH)))
+
+
+def _run_config(usage: "MetricsCallback", product: str) -> Dict[str, Any]:
+    # One checkpoint thread per product, so products resume independently
+    return {"callbacks": [usage], "metadata": {"product": product}, "configurable": {"thread_id": product}}
+
+
+def _start_input(
+    checkpointer: "SqliteCheckpointSaver", thread_id: str, resume: bool, inputs: Dict[str, Any]
+) -> Optional[Dict[str, Any]]:
+    """Workflow input: ``None`` continues a checkpointed thread, ``inputs`` starts it afresh."""
+    if resume and checkpointer.get_tuple({"configurable": {"thread_id": thread_id}}) is not None:
+        return None
+    checkpointer.delete_thread(thread_id)
+    return inputs
+
+
+def run_pipeline(
+    stream_faq: bool = False,
+    direct_assembly: bool = False,
+    reuse_answers: bool = False,
+    resume: bool = False,
+    faq_chunk_size: Optional[int] = 8,
+) -> None:
+    """Execute the LangGraph workflow to generate all content pages.
+
+    With ``stream_faq``, FAQ entries appear in ``output/faq.ndjson`` as they are
+    generated, and ``faq.json`` replaces it at the end. ``direct_assembly``
+    builds page blocks in code and asks the LLM only for prose fields.
+    ``reuse_answers`` fills FAQ answers already generated for a product with the
+    same relevant fields. FAQ questions are answered in concurrent chunks of
+    ``faq_chunk_size`` (None for one call). Prompt and completion tokens per
+    node are written to ``output/token_usage.json``, and per-node metrics and a
+    trace of the run to ``output/metrics.prom`` and ``output/trace.json``.
+
+    Every step is checkpointed to ``.cache/checkpoints.sqlite``; with ``resume``
+    an interrupted run continues from its last completed node instead of
+    starting over, and a finished run is not repeated.
+    """
+    data_path = BASE_DIR / "data" / "product_data.json"
+    output_dir = BASE_DIR / "output"
+    faq_sink = output_dir / "faq.ndjson" if stream_faq else None
+
+    _require_api_key()
+    _configure_cache()
+    _configure_scheduler()
+    _configure_clients()
+    checkpointer = _checkpointer()
+    thread_id = data_path.stem
+    if resume and thread_id in checkpointer.completed():
+        return
+
     # Build and run LangGraph workflow
-    workflow = build_workflow(data_path)
-    
-    # Execute workflow - sequential execution ensures all outputs are generated
-    initial_state = {}
-    final_state = workflow.invoke(initial_state)
+    workflow = build_workflow(
+        direct_assembly=direct_assembly,
+        answer_cache=_answer_cache(reuse_answers),
+        checkpointer=checkpointer,
+        faq_chunk_size=faq_chunk_size,
+    )
+
+    # Execute workflow - independent branches run in parallel from ingest.
+    # Checkpoints are written synchronously so a crash never loses a finished step.
+    usage = _metrics_callback()
+    initial_state = _start_input(checkpointer, thread_id, resume, product_input(data_path, faq_sink))
+    final_state = workflow.invoke(initial_state, config=_run_config(usage, thread_id), durability="sync")
 
     # Write outputs
-    if "faq_page" in final_state and final_state["faq_page"]:
-        write_json(output_dir / "faq.json", final_state["faq_page"])
-    
-    if "product_page" in final_state and final_state["product_page"]:
-        write_json(output_dir / "product_page.json", final_state["product_page"])
-    
-    if "comparison_page" in final_state and final_state["comparison_page"]:
-        write_json(output_dir / "comparison_page.json", final_state["comparison_page"])
+    write_pages(final_state, output_dir, faq_sink=faq_sink)
+    write_metrics(usage, output_dir)
+    checkpointer.mark_completed(thread_id)
 
 
-if __name__ == "__main__":
-    run_pipeline()
+async def arun_pipeline(
+    data_paths: Iterable[Path],
+    output_dir: Path = BASE_DIR / "output",
+    max_in_flight: int = 64,
+    stream_faq: bool = False,
+    direct_assembly: bool = False,
+    reuse_answers: bool = False,
+    resume: bool = False,
+    faq_chunk_size: Optional[int] = 8,
+) -> List[Dict[str, Any]]:
+    """Run the workflow for many products concurrently on the current event loop.
+
+    The workflow is compiled once and driven with ``abatch_as_completed``, the
+    product source of each run being part of its input state. At most
+    ``max_in_flight`` products are inside the workflow at any time, and each
+    product's pages are written as soon as it finishes, to
+    ``output_dir/<data file stem>/``; token totals, metrics and the trace for
+    the whole batch are written to ``output_dir``. With
+    ``resume``, products finished by an earlier run are skipped (and not
+    returned) and interrupted ones continue from their checkpoints.
+    """
+    _require_api_key()
+    _configure_cache()
+    _configure_scheduler()
+    _configure_clients()
+    usage = _metrics_callback()
+    checkpointer = _checkpointer()
+    # One query for the whole catalog, so resuming costs only the remaining products
+    completed = checkpointer.completed() if resume else set()
+    pending = [Path(path) for path in data_paths if Path(path).stem not in completed]
 
+    workflow = build_workflow(
+        direct_assembly=direct_assembly,
+        answer_cache=_answer_cache(reuse_answers),
+        checkpointer=checkpointer,
+        faq_chunk_size=faq_chunk_size,
+    )
+    faq_sinks = [output_dir / path.stem / "faq.ndjson" if stream_faq else None for path in pending]
+    inputs = [
+        _start_input(checkpointer, path.stem, resume, product_input(path, faq_sink))
+        for path, faq_sink in zip(pending, faq_sinks)
+    ]
+    configs = [{**_run_config(usage, path.stem), "max_concurrency": max_in_flight} for path in pending]
 
+    states: List[Dict[str, Any]] = [{} for _ in pending]
+    async for index, final_state in workflow.abatch_as_completed(inputs, configs, durability="sync"):
+        await asyncio.to_thread(write_pages, final_state, output_dir / pending[index].stem, faq_sinks[index])
+        checkpointer.mark_completed(pending[index].stem)
+        states[index] = final_state
+    await asyncio.to_thread(write_metrics, usage, output_dir)
+    return states
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate content pages with the LangGraph workflow.")
+    parser.add_argument("--resume", action="store_true", help="continue from the checkpoints of an interrupted run")
+    args = parser.parse_args()
+    run_pipeline(
+        stream_faq=os.getenv("FAQ_STREAM", "0") == "1",
+        direct_assembly=os.getenv("DIRECT_ASSEMBLY", "0") == "1",
+        reuse_answers=os.getenv("FAQ_REUSE", "0") == "1",
+        resume=args.resume,
+        faq_chunk_size=int(os.getenv("FAQ_CHUNK_SIZE", "8")) or None,
+    )
@@ -0,0 +1,195 @@
+"""Per-node metrics and tracing for both pipelines.
+
+``RunMetrics`` collects one span per graph node, LLM call and tool call, plus
+counters and latency histograms derived from them. One instance covers a run
+and exports it two ways: a Prometheus text-format file (for the node_exporter
+textfile collector or a scrape proxy) and a Chrome-trace JSON file that opens in
+chrome://tracing or Perfetto.
+
+Histograms keep per-bucket counts, a sum and a count per series, so memory and
+export time do not grow with the number of samples. The trace keeps only the
+most recent ``max_spans`` spans.
+
+``AutomationGraph`` reports its nodes directly; the LangGraph workflow is
+observed through ``src.metrics_callback.MetricsCallback`` in the run config.
+"""
+
+import json
+import pickle
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+# Latency histogram buckets, in seconds
+BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+METRIC_PREFIX = "content_pipeline"
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def payload_size(value: Any) -> int:
+    """Serialized size in bytes of a node's output."""
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return len(repr(value).encode("utf-8"))
+
+
+def _labels(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(labels: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + "}"
+
+
+class _Histogram:
+    """Per-bucket (non-cumulative) sample counts plus the sum and count of one series."""
+
+    __slots__ = ("buckets", "sum", "count")
+
+    def __init__(self) -> None:
+        # One slot per bound in BUCKETS, plus one for samples above the last
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.buckets[bisect_left(BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def snapshot(self) -> "_Histogram":
+        copy = _Histogram()
+        copy.buckets, copy.sum, copy.count = list(self.buckets), self.sum, self.count
+        return copy
+
+
+class RunMetrics:
+    """Thread-safe span, counter and histogram store for one run.
+
+    ``max_spans`` bounds the spans kept for the trace (oldest dropped first);
+    0 keeps none. Counters and histograms always cover every span.
+    """
+
+    def __init__(self, max_spans: int = 10_000) -> None:
+        self.spans: Deque[Dict[str, Any]] = deque(maxlen=max_spans)
+        self._counters: Dict[str, Dict[LabelKey, float]] = defaultdict(lambda: defaultdict(float))
+        self._histograms: Dict[str, Dict[LabelKey, _Histogram]] = defaultdict(lambda: defaultdict(_Histogram))
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def now() -> float:
+        return time.perf_counter()
+
+    def add(self, name: str, value: float, **labels: str) -> None:
+        with self._lock:
+            self._counters[name][_labels(labels)] += value
+
+    def span(
+        self,
+        category: str,
+        name: str,
+        start: float,
+        end: float,
+        labels: Dict[str, str],
+        process: Optional[str] = None,
+        **values: float,
+    ) -> None:
+        """Record one timed unit; each non-zero value also feeds ``<category>_<value>_total``.
+
+        ``process`` groups spans in the trace only (e.g. per product) and is kept out
+        of the metric labels so series count does not grow with the catalog.
+        """
+        key = _labels(labels)
+        with self._lock:
+            if self.spans.maxlen:
+                self.spans.append(
+                    {
+                        "category": category,
+                        "name": name,
+                        "start": start,
+                        "end": end,
+                        "labels": labels,
+                        "process": process,
+                        "values": values,
+                    }
+                )
+            self._histograms[f"{category}_duration_seconds"][key].observe(end - start)
+            for value_name, value in values.items():
+                if value:
+                    self._counters[f"{category}_{value_name}_total"][key] += value
+
+    def prometheus(self) -> str:
+        """Prometheus text exposition format (counters and cumulative histograms)."""
+        lines: List[str] = []
+        with self._lock:
+            counters = {name: dict(series) for name, series in self._counters.items()}
+            histograms = {name: {k: v.snapshot() for k, v in series.items()} for name, series in self._histograms.items()}
+        for name in sorted(counters):
+            metric = f"{METRIC_PREFIX}_{name}"
+            lines.append(f"# TYPE {metric} counter")
+            for labels, value in sorted(counters[name].items()):
+                lines.append(f"{metric}{_format_labels(labels)} {value:g}")
+        for name in sorted(histograms):
+            metric = f"{METRIC_PREFIX}_{name}"
+            lines.append(f"# TYPE {metric} histogram")
+            for labels, histogram in sorted(histograms[name].items(), key=lambda item: item[0]):
+                count = 0
+                for bound, in_bucket in zip(BUCKETS, histogram.buckets):
+                    count += in_bucket
+                    lines.append(f"{metric}_bucket{_format_labels(labels, ('le', f'{bound:g}'))} {count}")
+                lines.append(f"{metric}_bucket{_format_labels(labels, ('le', '+Inf'))} {histogram.count}")
+                lines.append(f"{metric}_sum{_format_labels(labels)} {histogram.sum:.6f}")
+                lines.append(f"{metric}_count{_format_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """Trace Event Format: one process per product (or pipeline), one thread per node."""
+        with self._lock:
+            spans = list(self.spans)
+        processes: Dict[str, int] = {}
+        threads: Dict[Tuple[int, str], int] = {}
+        events: List[Dict[str, Any]] = []
+        for span in sorted(spans, key=lambda item: item["start"]):
+            labels = span["labels"]
+            process = span["process"] or labels.get("pipeline") or "run"
+            pid = processes.setdefault(process, len(processes) + 1)
+            thread = labels.get("node") or span["name"]
+            tid = threads.setdefault((pid, thread), len(threads) + 1)
+            events.append(
+                {
+                    "name": span["name"],
+                    "cat": span["category"],
+                    "ph": "X",
+                    "ts": round((span["start"] - self._origin) * 1e6, 1),
+                    "dur": round((span["end"] - span["start"]) * 1e6, 1),
+                    "pid": pid,
+                    "tid": tid,
+                    "args": {**labels, **span["values"]},
+                }
+            )
+        for process, pid in processes.items():
+            events.append({"name": "process_name", "ph": "M", "pid": pid, "args": {"name": process}})
+        for (pid, thread), tid in threads.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": thread}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_prometheus(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Written via rename so a scraping collector never reads a partial file
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text(self.prometheus(), encoding="utf-8")
+        tmp_path.replace(path)
+
+    def write_chrome_trace(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.chrome_trace()), encoding="utf-8")
@@ -0,0 +1,126 @@
+"""LangChain callback feeding ``RunMetrics`` from a LangGraph workflow run."""
+
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from langchain_core.outputs import LLMResult
+
+from src.metrics import RunMetrics, payload_size
+from src.token_usage import TokenUsage
+
+
+class MetricsCallback(TokenUsage):
+    """LangChain callback that records LangGraph node, LLM and tool spans into ``RunMetrics``.
+
+    Token totals from ``TokenUsage.report`` stay available. Queue wait and retries
+    come from the shared LLM scheduler, cache hits from the SQLite LLM cache.
+    """
+
+    def __init__(self, metrics: Optional[RunMetrics] = None, pipeline: str = "langgraph") -> None:
+        super().__init__()
+        self.metrics = metrics or RunMetrics()
+        self.pipeline = pipeline
+        self._nodes: Dict[UUID, Tuple[float, Dict[str, str], str]] = {}
+        self._tools: Dict[UUID, Tuple[float, str, Dict[str, str], str]] = {}
+
+    def _labels(self, metadata: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        return {"pipeline": self.pipeline, "node": (metadata or {}).get("langgraph_node", "unknown")}
+
+    @staticmethod
+    def _product(metadata: Optional[Dict[str, Any]]) -> str:
+        return (metadata or {}).get("product", "unknown")
+
+    def on_chain_start(
+        self,
+        serialized: Dict[str, Any],
+        inputs: Dict[str, Any],
+        *,
+        run_id: UUID,
+        tags: Optional[List[str]] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        name: Optional[str] = None,
+        **kwargs: Any,
+    ) -> None:
+        # Runnable.with_retry tags each repeated attempt; scheduler retries arrive via generation_info
+        if any(tag.startswith("retry:attempt:") for tag in tags or ()):
+            self.metrics.add("llm_retries_total", 1, **self._labels(metadata))
+        # The node's own run carries the node name; nested chains only inherit the metadata
+        if name is None or name != (metadata or {}).get("langgraph_node"):
+            return
+        with self._lock:
+            self._nodes[run_id] = (self.metrics.now(), self._labels(metadata), self._product(metadata))
+
+    def _end_chain(self, run_id: UUID, outputs: Any, errors: int) -> None:
+        with self._lock:
+            started = self._nodes.pop(run_id, None)
+        if started is None:
+            return
+        start, labels, product = started
+        self.metrics.span(
+            "node",
+            labels["node"],
+            start,
+            self.metrics.now(),
+            labels,
+            process=product,
+            payload_bytes=payload_size(outputs) if outputs is not None else 0,
+            errors=errors,
+        )
+
+    def on_chain_end(self, outputs: Dict[str, Any], *, run_id: UUID, **kwargs: Any) -> None:
+        self._end_chain(run_id, outputs, 0)
+
+    def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end_chain(run_id, None, 1)
+
+    def _record(self, call: Dict[str, Any], response: LLMResult) -> None:
+        super()._record(call, response)
+        info: Dict[str, Any] = {}
+        for generations in response.generations:
+            for generation in generations:
+                info.update(generation.generation_info or {})
+        cache_hit = bool(info.get("cache_hit"))
+        self.metrics.span(
+            "llm",
+            call["model"],
+            call["started"],
+            call["ended"],
+            {"pipeline": self.pipeline, "node": call["node"]},
+            process=call["product"],
+            calls=1,
+            prompt_tokens=call["prompt_tokens"],
+            completion_tokens=call["completion_tokens"],
+            # A cache hit carries the stats of the call that filled the cache
+            queue_wait_seconds=0 if cache_hit else info.get("queue_wait", 0),
+            retries=0 if cache_hit else info.get("retries", 0),
+            cache_hits=int(cache_hit),
+        )
+
+    def on_tool_start(
+        self,
+        serialized: Dict[str, Any],
+        input_str: str,
+        *,
+        run_id: UUID,
+        metadata: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        tool = (serialized or {}).get("name") or kwargs.get("name") or "tool"
+        with self._lock:
+            self._tools[run_id] = (self.metrics.now(), tool, self._labels(metadata), self._product(metadata))
+
+    def _end_tool(self, run_id: UUID, errors: int) -> None:
+        with self._lock:
+            started = self._tools.pop(run_id, None)
+        if started is None:
+            return
+        start, tool, labels, product = started
+        self.metrics.span(
+            "tool", tool, start, self.metrics.now(), {**labels, "tool": tool}, process=product, calls=1, errors=errors
+        )
+
+    def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end_tool(run_id, 0)
+
+    def on_tool_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end_tool(run_id, 1)
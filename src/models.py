@@ -1,20 +1,59 @@
+import sys
 from dataclasses import dataclass, field
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, Tuple
 
 
-@dataclass
+def _interned(values: Iterable[str]) -> Tuple[str, ...]:
+    return tuple(sys.intern(value) for value in values)
+
+
+@dataclass(frozen=True)
 class Product:
-    """Normalized product representation."""
+    """Normalized product representation.
+
+    Immutable and slotted so one canonical instance can be shared by reference
+    across agents and graph state. Enum-like values (skin types, ingredients,
+    side effects) are interned, so a catalog holds one copy of each string.
+    """
+
+    __slots__ = (
+        "name",
+        "concentration",
+        "skin_type",
+        "key_ingredients",
+        "benefits",
+        "how_to_use",
+        "side_effects",
+        "price",
+    )
 
     name: str
     concentration: str
-    skin_type: List[str]
-    key_ingredients: List[str]
-    benefits: List[str]
+    skin_type: Tuple[str, ...]
+    key_ingredients: Tuple[str, ...]
+    benefits: Tuple[str, ...]
     how_to_use: str
-    side_effects: List[str]
+    side_effects: Tuple[str, ...]
     price: str
 
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "concentration", sys.intern(self.concentration))
+        object.__setattr__(self, "skin_type", _interned(self.skin_type))
+        object.__setattr__(self, "key_ingredients", _interned(self.key_ingredients))
+        object.__setattr__(self, "benefits", tuple(self.benefits))
+        object.__setattr__(self, "side_effects", _interned(self.side_effects))
+
+    def __reduce__(self):
+        return (Product, tuple(getattr(self, name) for name in self.__slots__))
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Product":
+        return cls(**data)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-ready view, e.g. for prompts and tool arguments."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
 
 @dataclass
 class Question:
@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from src.agents.comparison_agent import ComparisonAgent
 from src.agents.data_ingestion_agent import DataIngestionAgent
@@ -7,13 +7,29 @@ from src.agents.faq_agent import FaqAgent
 from src.agents.product_page_agent import ProductPageAgent
 from src.agents.question_generation_agent import QuestionGenerationAgent
 from src.automation_graph import AutomationGraph, Node
+from src.incremental import DependencyTracker, FingerprintStore
+from src.metrics import RunMetrics
 from src.templates import build_engine
 
 
 class Orchestrator:
-    """Configures agents and executes the automation graph."""
+    """Configures agents and executes the automation graph.
 
-    def __init__(self, data_path: Path) -> None:
+    With a ``store``, each run recomputes only the blocks and answers that read a
+    product field which changed since the previous run; ``full`` ignores the store.
+    Pass ``metrics`` to record per-node timings for every run.
+    """
+
+    def __init__(
+        self,
+        data_path: Optional[Path] = None,
+        max_workers: int = 4,
+        store: Optional[FingerprintStore] = None,
+        full: bool = False,
+        metrics: Optional[RunMetrics] = None,
+    ) -> None:
+        self.store = store
+        self.full = full
         engine = build_engine()
         self.graph = AutomationGraph(
             nodes=[
@@ -22,10 +38,22 @@ class Orchestrator:
                 Node("faq", FaqAgent(engine), depends_on=["questions"]),
                 Node("product_page", ProductPageAgent(engine), depends_on=["ingest"]),
                 Node("comparison", ComparisonAgent(engine), depends_on=["ingest"]),
-            ]
+            ],
+            max_workers=max_workers,
+            metrics=metrics,
         )
 
-    def run(self) -> Dict[str, Any]:
-        return self.graph.run(payload={})
+    def _execute(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        if self.store is None:
+            return self.graph.run(payload=payload)
+        tracker = DependencyTracker(self.store, full=self.full)
+        result = self.graph.run(payload={**payload, "tracker": tracker})
+        tracker.commit()
+        return result
 
+    def run(self) -> Dict[str, Any]:
+        return self._execute({})
 
+    def run_record(self, raw: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the graph for one raw product record instead of ``data_path``."""
+        return self._execute({"raw": raw})
@@ -0,0 +1,72 @@
+"""Pydantic schemas for every structured LLM response, and the shared parser.
+
+``parse_output`` extracts the JSON value from a response in one pass (see
+``src.json_stream.extract_json``) and validates it against the agent's schema,
+so every agent accepts the same range of slightly malformed output and fails
+the same way (``ValueError``) when it cannot be used.
+"""
+
+from typing import Any, Dict, List, Type, TypeVar
+
+from pydantic import BaseModel, ConfigDict, TypeAdapter
+
+from src.json_stream import extract_json
+
+T = TypeVar("T")
+
+
+class QuestionItem(BaseModel):
+    text: str
+    category: str
+
+
+class FaqItem(BaseModel):
+    question: str
+    answer: str
+    category: str
+
+
+class ProductDescription(BaseModel):
+    description: str
+
+
+class Recommendations(BaseModel):
+    primary: str
+    alternative: str
+
+
+class ProductPageOutput(BaseModel):
+    """Full product page, as the tool-calling agent assembles it."""
+
+    model_config = ConfigDict(extra="allow")
+
+    template: str = "product_page"
+    summary: Dict[str, Any]
+    benefits: Dict[str, Any]
+    ingredients: Dict[str, Any]
+    usage: Dict[str, Any]
+    safety: Dict[str, Any]
+
+
+class ComparisonPageOutput(BaseModel):
+    """Full comparison page, as the tool-calling agent assembles it."""
+
+    model_config = ConfigDict(extra="allow")
+
+    template: str = "comparison_page"
+    comparison: Dict[str, Any]
+    who_should_choose_which: Recommendations
+
+
+QuestionList = List[QuestionItem]
+
+_adapters: Dict[Any, TypeAdapter] = {}
+
+
+def parse_output(text: str, schema: Type[T]) -> T:
+    """Validated ``schema`` instance from an LLM response; ``ValueError`` if it has none."""
+    adapter = _adapters.get(schema)
+    if adapter is None:
+        adapter = _adapters[schema] = TypeAdapter(schema)
+    # pydantic's ValidationError is a ValueError too
+    return adapter.validate_python(extract_json(text))
@@ -0,0 +1,56 @@
+"""Shared, prefix-stable product context for every LLM prompt.
+
+Provider-side prompt caching matches on the longest identical prefix of the
+request. Every agent therefore opens with the same system message, holding the
+same preamble and the same serialization of the product, and only then adds its
+own instructions. Calls for one product share that prefix byte for byte, whatever
+node sends them.
+
+Agents whose output must not change with some field (question generation and
+FAQ answering do not depend on the price) see that field as a ``<<field>>``
+placeholder, which ``fill_placeholders`` replaces with the real value after
+generation. Their prompts, and so their LLM cache keys, are then unchanged by a
+price-only update.
+"""
+
+import json
+from functools import lru_cache
+from typing import Tuple
+
+from src.models import Product
+
+CONTEXT_PREAMBLE = (
+    "You are part of a content generation system for skincare product pages. "
+    "All facts must come from the product data below; never invent ingredients, "
+    "benefits, prices or side effects. A value written as <<field>> is filled in "
+    "later: copy that placeholder verbatim wherever the value belongs.\n\n"
+    "Product data (JSON):\n"
+)
+
+
+@lru_cache(maxsize=1024)
+def product_context(product: Product, placeholders: Tuple[str, ...] = ()) -> str:
+    """Canonical product serialization: fixed field order, non-ASCII kept as-is.
+
+    Fields named in ``placeholders`` are serialized as ``<<field>>``.
+    """
+    data = product.to_dict()
+    for field in placeholders:
+        data[field] = _placeholder(field)
+    return json.dumps(data, ensure_ascii=False, indent=2)
+
+
+def _placeholder(field: str) -> str:
+    return f"<<{field}>>"
+
+
+def fill_placeholders(text: str, product: Product, placeholders: Tuple[str, ...]) -> str:
+    """``text`` with each ``<<field>>`` placeholder replaced by the product's value."""
+    for field in placeholders:
+        text = text.replace(_placeholder(field), str(getattr(product, field)))
+    return text
+
+
+def context_message() -> Tuple[str, str]:
+    """Leading prompt message shared by every agent; fill ``product_context`` on invoke."""
+    return ("system", CONTEXT_PREAMBLE + "{product_context}")
@@ -1,13 +1,31 @@
 """Simple template engine that wires logic blocks into structured pages."""
 
+import copy
 from dataclasses import dataclass, field
-from typing import Any, Callable, Dict, List
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional
+
+if TYPE_CHECKING:
+    from src.incremental import DependencyTracker
+
+RenderFn = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+_IMMUTABLE = (str, int, float, bool, type(None))
 
 
 @dataclass
 class TemplateField:
+    """One output field.
+
+    ``constant`` fields are resolved once when the template is compiled; every
+    rendered page gets its own copy of a mutable value. Fields that share one
+    resolver object call it once per render; ``select`` picks a key from its
+    result.
+    """
+
     name: str
     resolver: Callable[[Dict[str, Any]], Any]
+    constant: bool = False
+    select: Optional[str] = None
 
 
 @dataclass
@@ -16,28 +34,79 @@ class Template:
     fields: List[TemplateField] = field(default_factory=list)
 
 
+def compile_template(template: Template) -> RenderFn:
+    """Generate a render function that builds the page as one dict literal."""
+    namespace: Dict[str, Any] = {"_copy": copy.deepcopy}
+    slots: Dict[int, str] = {}
+    lines: List[str] = []
+    entries = [f"{'template'!r}: {template.name!r}"]
+    for index, template_field in enumerate(template.fields):
+        if template_field.constant:
+            namespace[f"_const{index}"] = constant = template_field.resolver({})
+            value = f"_const{index}" if isinstance(constant, _IMMUTABLE) else f"_copy(_const{index})"
+        else:
+            key = id(template_field.resolver)
+            if key not in slots:
+                slots[key] = f"_value{len(slots)}"
+                namespace[f"_resolver{len(slots) - 1}"] = template_field.resolver
+                lines.append(f"    {slots[key]} = _resolver{len(slots) - 1}(ctx)")
+            value = slots[key]
+        if template_field.select is not None:
+            value = f"{value}[{template_field.select!r}]"
+        entries.append(f"{template_field.name!r}: {value}")
+    lines.append("    return {" + ", ".join(entries) + "}")
+    exec("def render(ctx):\n" + "\n".join(lines), namespace)
+    return namespace["render"]
+
+
 class TemplateRegistry:
     def __init__(self) -> None:
         self._templates: Dict[str, Template] = {}
+        self._compiled: Dict[str, RenderFn] = {}
 
     def register(self, template: Template) -> None:
         self._templates[template.name] = template
+        self._compiled[template.name] = compile_template(template)
 
     def get(self, name: str) -> Template:
         if name not in self._templates:
             raise KeyError(f"Template '{name}' is not registered")
         return self._templates[name]
 
+    def compiled(self, name: str) -> RenderFn:
+        if name not in self._compiled:
+            raise KeyError(f"Template '{name}' is not registered")
+        return self._compiled[name]
+
 
 class TemplateEngine:
     def __init__(self, registry: TemplateRegistry) -> None:
         self.registry = registry
 
-    def render(self, template_name: str, context: Dict[str, Any]) -> Dict[str, Any]:
+    def render(
+        self,
+        template_name: str,
+        context: Dict[str, Any],
+        tracker: Optional["DependencyTracker"] = None,
+    ) -> Dict[str, Any]:
+        """Render a template; with a tracker, fields whose product reads are unchanged are reused."""
+        if tracker is None:
+            return self.registry.compiled(template_name)(context)
         template = self.registry.get(template_name)
         rendered: Dict[str, Any] = {"template": template.name}
         for field in template.fields:
-            rendered[field.name] = field.resolver(context)
+            if field.constant:
+                value = field.resolver({})
+            else:
+                value = tracker.compute(
+                    f"{template.name}.{field.name}",
+                    lambda product, resolver=field.resolver: resolver({**context, "product": product}),
+                    context["product"],
+                )
+            rendered[field.name] = value if field.select is None else value[field.select]
         return rendered
 
-
+    def render_many(self, template_name: str, contexts: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Render one template for many contexts with a single compiled-function lookup."""
+        render = self.registry.compiled(template_name)
+        return [render(context) for context in contexts]
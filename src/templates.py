@@ -41,6 +41,7 @@ def build_registry() -> TemplateRegistry:
                     "primary": "Choose GlowBoost for faster brightening and spot fading.",
                     "alternative": "Choose Product B if you want a gentler start with Vitamin C.",
                 },
+                constant=True,
             ),
         ],
     )
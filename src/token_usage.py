@@ -0,0 +1,141 @@
+"""Local prompt and completion token accounting for LLM calls.
+
+``TokenUsage`` is a LangChain callback handler: pass it in the ``callbacks`` of
+a workflow config and every chat model call underneath is counted, grouped by
+the LangGraph node that made it and by the ``product`` key in the config
+metadata. Provider-reported usage is used when the response carries it;
+otherwise tokens are counted locally with tiktoken, or estimated from character
+count when the encoding files are not available offline.
+"""
+
+import math
+import threading
+import time
+from collections import defaultdict
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import LLMResult
+
+# OpenAI chat format overhead: tokens per message, plus the reply primer
+_TOKENS_PER_MESSAGE = 3
+_REPLY_PRIMER = 3
+_CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=None)
+def _encoding(model: str) -> Any:
+    try:
+        import tiktoken
+
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception:  # tiktoken missing, or its encoding files cannot be downloaded
+        return None
+
+
+def count_tokens(text: str, model: str = "gpt-4o-mini") -> int:
+    """Token count of ``text`` for ``model``; a character-based estimate if no encoding loads."""
+    encoding = _encoding(model)
+    if encoding is None:
+        return math.ceil(len(text) / _CHARS_PER_TOKEN)
+    return len(encoding.encode(text))
+
+
+def count_message_tokens(messages: Sequence[BaseMessage], model: str = "gpt-4o-mini") -> int:
+    """Prompt tokens for a chat request, including per-message framing."""
+    total = _REPLY_PRIMER
+    for message in messages:
+        content = message.content if isinstance(message.content, str) else str(message.content)
+        total += _TOKENS_PER_MESSAGE + count_tokens(content, model)
+    return total
+
+
+def _model_name(serialized: Dict[str, Any], invocation_params: Optional[Dict[str, Any]]) -> str:
+    params = invocation_params or {}
+    kwargs = serialized.get("kwargs", {}) if serialized else {}
+    return params.get("model_name") or params.get("model") or kwargs.get("model_name") or "gpt-4o-mini"
+
+
+class TokenUsage(BaseCallbackHandler):
+    """Aggregates prompt and completion tokens per call, node and product."""
+
+    def __init__(self) -> None:
+        self.calls: List[Dict[str, Any]] = []
+        self._pending: Dict[UUID, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def on_chat_model_start(
+        self,
+        serialized: Dict[str, Any],
+        messages: List[List[BaseMessage]],
+        *,
+        run_id: UUID,
+        metadata: Optional[Dict[str, Any]] = None,
+        invocation_params: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        metadata = metadata or {}
+        model = _model_name(serialized, invocation_params)
+        with self._lock:
+            self._pending[run_id] = {
+                "node": metadata.get("langgraph_node", "unknown"),
+                "product": metadata.get("product", "unknown"),
+                "model": model,
+                "prompt_tokens": sum(count_message_tokens(batch, model) for batch in messages),
+                "started": time.perf_counter(),
+            }
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            call = self._pending.pop(run_id, None)
+        if call is None:
+            return
+        completion = 0
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                # Cache hits carry only a zeroed cost, not the token counts
+                if usage and "input_tokens" in usage:
+                    # Prefer what the provider billed over the local count
+                    call["prompt_tokens"] = usage["input_tokens"]
+                    completion += usage["output_tokens"]
+                else:
+                    completion += count_tokens(generation.text, call["model"])
+        call["completion_tokens"] = completion
+        call["ended"] = time.perf_counter()
+        self._record(call, response)
+
+    def _record(self, call: Dict[str, Any], response: LLMResult) -> None:
+        with self._lock:
+            self.calls.append(call)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            self._pending.pop(run_id, None)
+
+    def _totals(self, key: Optional[str]) -> Dict[str, Dict[str, int]]:
+        totals: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0}
+        )
+        with self._lock:
+            calls = list(self.calls)
+        for call in calls:
+            bucket = totals[call[key] if key else "total"]
+            bucket["calls"] += 1
+            bucket["prompt_tokens"] += call["prompt_tokens"]
+            bucket["completion_tokens"] += call["completion_tokens"]
+        return dict(totals)
+
+    def report(self) -> Dict[str, Any]:
+        """Totals overall, per node and per product."""
+        return {
+            "total": self._totals(None).get("total", {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0}),
+            "by_node": self._totals("node"),
+            "by_product": self._totals("product"),
+        }
@@ -1,10 +1,16 @@
-"""LangChain tools for content generation logic blocks."""
+"""LangChain tools for content generation logic blocks.
+
+The tools are thin wrappers over ``src.content_blocks``: tool calls arrive as JSON,
+so each wrapper builds a Product once and delegates. Code that already holds a
+Product should call ``content_blocks`` directly.
+"""
 
 from typing import Dict, List
 
 from langchain.tools import tool
 from pydantic import BaseModel, Field
 
+from src import content_blocks
 from src.models import Product
 
 
@@ -24,91 +30,37 @@ class ComparisonInput(BaseModel):
 @tool
 def build_core_summary(product: Dict) -> Dict[str, str]:
     """Builds a high-level product summary with name, tagline, and price."""
-    p = Product(**product)
-    return {
-        "name": p.name,
-        "tagline": f"{p.concentration} serum formulated for {', '.join(p.skin_type)} skin.",
-        "price": p.price,
-    }
+    return content_blocks.build_core_summary(Product.from_dict(product))
 
 
 @tool
 def build_usage_block(product: Dict) -> Dict[str, str]:
     """Builds usage instructions block with how-to-use and tips."""
-    p = Product(**product)
-    return {
-        "how_to_use": p.how_to_use,
-        "usage_tips": [
-            "Use on clean, dry skin.",
-            "Follow with moisturizer and sunscreen.",
-            "Introduce gradually if skin is sensitive.",
-        ],
-    }
+    return content_blocks.build_usage_block(Product.from_dict(product))
 
 
 @tool
 def build_safety_block(product: Dict) -> Dict[str, List[str]]:
     """Builds safety and side-effects information block."""
-    p = Product(**product)
-    return {
-        "side_effects": p.side_effects,
-        "safety_notes": [
-            "Patch test before first use.",
-            "Avoid mixing with strong exfoliants in the same routine.",
-        ],
-    }
+    return content_blocks.build_safety_block(Product.from_dict(product))
 
 
 @tool
 def build_ingredient_block(product: Dict) -> Dict[str, List[str]]:
     """Builds ingredient-focused content block."""
-    p = Product(**product)
-    return {
-        "key_ingredients": p.key_ingredients,
-        "ingredient_focus": [
-            "Vitamin C supports brightening and even tone.",
-            "Hyaluronic Acid supports hydration without heaviness.",
-        ],
-    }
+    return content_blocks.build_ingredient_block(Product.from_dict(product))
 
 
 @tool
 def build_benefits_block(product: Dict) -> Dict[str, List[str]]:
     """Builds benefits and ideal-for information block."""
-    p = Product(**product)
-    return {
-        "benefits": p.benefits,
-        "ideal_for": p.skin_type,
-    }
+    return content_blocks.build_benefits_block(Product.from_dict(product))
 
 
 @tool
 def build_comparison_block(product_a: Dict, product_b: Dict) -> Dict:
     """Builds comparison block between two products."""
-    p_a = Product(**product_a)
-    p_b = Product(**product_b)
-    return {
-        "products": {
-            "primary": {
-                "name": p_a.name,
-                "concentration": p_a.concentration,
-                "key_ingredients": p_a.key_ingredients,
-                "benefits": p_a.benefits,
-                "price": p_a.price,
-            },
-            "alternative": {
-                "name": p_b.name,
-                "concentration": p_b.concentration,
-                "key_ingredients": p_b.key_ingredients,
-                "benefits": p_b.benefits,
-                "price": p_b.price,
-            },
-        },
-        "recommendation_logic": [
-            "Pick the primary serum for brightening and spot fading with lightweight feel.",
-            "Pick the alternative for first-time Vitamin C users wanting lower strength with added soothing.",
-        ],
-    }
+    return content_blocks.build_comparison(Product.from_dict(product_a), Product.from_dict(product_b))
 
 
 def get_all_tools():
@@ -121,4 +73,3 @@ def get_all_tools():
         build_benefits_block,
         build_comparison_block,
     ]
-
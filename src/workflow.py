@@ -1,61 +1,137 @@
-"""LangGraph workflow for orchestrating the multi-agent content generation system."""
+"""LangGraph workflow for orchestrating the multi-agent content generation system.
 
-from typing import Annotated, TypedDict
+LangGraph is imported when a workflow is built and the LangChain agents when a
+node first runs, so importing this module (and ``src.main``) stays cheap.
+"""
 
-from langgraph.graph import END, StateGraph
+import threading
+from typing import Annotated, Any, Dict, Optional, TypedDict
 
-from src.agents_langchain import (
-    ComparisonAgent,
-    DataIngestionAgent,
-    FaqAgent,
-    ProductPageAgent,
-    QuestionGenerationAgent,
-)
+from src.models import Product
+
+
+def _keep_latest(current: Any, update: Any) -> Any:
+    """Reducer for single-writer keys: parallel branches never clobber with empties."""
+    return current if update is None else update
 
 
 class WorkflowState(TypedDict, total=False):
-    """State passed between agents in the workflow."""
+    """State passed between agents in the workflow.
+
+    Every key has exactly one writing node and a reducer, so the parallel branches
+    below can return partial updates in the same superstep without conflicts.
+    """
+
+    # Inputs: the product source (a raw record or a JSON file) and an optional FAQ stream file
+    product_data: Annotated[dict, _keep_latest]
+    data_path: Annotated[str, _keep_latest]
+    faq_sink: Annotated[str, _keep_latest]
+
+    product: Annotated[Product, _keep_latest]  # Canonical parsed product, shared by reference
+    questions: Annotated[list, _keep_latest]  # Generated questions
+    faqs: Annotated[list, _keep_latest]  # FAQ entries
+    faq_page: Annotated[dict, _keep_latest]  # Rendered FAQ page
+    product_page: Annotated[dict, _keep_latest]  # Rendered product page
+    comparison_page: Annotated[dict, _keep_latest]  # Rendered comparison page
+
+
+class _LazyAgent:
+    """Constructs an agent from ``src.agents_langchain`` on its first call.
+
+    Compiling the graph then creates no LLM clients or AgentExecutors, and a
+    branch that never runs never pays for its agent.
+    """
+
+    def __init__(self, name: str, **kwargs: Any) -> None:
+        self._name = name
+        self._kwargs = kwargs
+        self._agent: Optional[Any] = None
+        self._lock = threading.Lock()
 
-    product: Annotated[dict, "Parsed product data"]
-    questions: Annotated[list, "Generated questions"]
-    faqs: Annotated[list, "FAQ entries"]
-    faq_page: Annotated[dict, "Rendered FAQ page"]
-    product_page: Annotated[dict, "Rendered product page"]
-    comparison_page: Annotated[dict, "Rendered comparison page"]
+    def _get(self) -> Any:
+        if self._agent is None:
+            with self._lock:
+                if self._agent is None:
+                    from src import agents_langchain
 
+                    self._agent = getattr(agents_langchain, self._name)(**self._kwargs)
+        return self._agent
 
-def build_workflow(data_path):
+    def run(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        return self._get().run(state)
+
+    async def arun(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        return await self._get().arun(state)
+
+
+def _node(agent: _LazyAgent) -> Any:
+    from langchain_core.runnables import RunnableLambda
+
+    return RunnableLambda(agent.run, afunc=agent.arun)
+
+
+def build_workflow(
+    data_path=None, faq_sink=None, direct_assembly=False, answer_cache=None, checkpointer=None, faq_chunk_size=8
+):
     """Builds and returns the LangGraph workflow.
-    
-    Sequential execution ensures all outputs are generated:
-    ingest -> generate_questions -> generate_faq -> generate_product_page -> generate_comparison -> END
+
+    The product is read from the input state, so one compiled workflow serves a
+    whole catalog through ``batch``/``abatch`` (see ``product_input``);
+    ``data_path`` and ``faq_sink`` here are only defaults for inputs that omit
+    them. When a FAQ sink is set, FAQ entries are streamed to it as NDJSON while
+    they are generated. ``direct_assembly`` builds the product and comparison
+    pages from the content blocks with one prose-only LLM call each. An
+    ``answer_cache`` shared between workflows reuses FAQ answers across products.
+    FAQ questions are answered in concurrent chunks of ``faq_chunk_size``
+    (None for a single call).
+    With a ``checkpointer`` the state after each step is saved under the run's
+    ``thread_id``, and invoking with ``None`` continues an interrupted run.
+
+    Branches that only need the parsed product fan out from ingest and run in
+    parallel, so end-to-end latency is the longest branch rather than the sum:
+
+    ingest -> generate_questions -> generate_faq -> END
+           -> generate_product_page ------------> END
+           -> generate_comparison --------------> END
     """
-    # Initialize agents
-    ingest_agent = DataIngestionAgent(data_path)
-    question_agent = QuestionGenerationAgent()
-    faq_agent = FaqAgent()
-    product_page_agent = ProductPageAgent()
-    comparison_agent = ComparisonAgent()
+    from langgraph.graph import END, StateGraph
+
+    # Agents are built on first use
+    ingest_agent = _LazyAgent("DataIngestionAgent", data_path=data_path)
+    question_agent = _LazyAgent("QuestionGenerationAgent")
+    faq_agent = _LazyAgent("FaqAgent", stream_sink=faq_sink, answer_cache=answer_cache, chunk_size=faq_chunk_size)
+    product_page_agent = _LazyAgent("ProductPageAgent", direct=direct_assembly)
+    comparison_agent = _LazyAgent("ComparisonAgent", direct=direct_assembly)
 
     # Define workflow graph
     workflow = StateGraph(WorkflowState)
 
-    # Add nodes
-    workflow.add_node("ingest", ingest_agent.run)
-    workflow.add_node("generate_questions", question_agent.run)
-    workflow.add_node("generate_faq", faq_agent.run)
-    workflow.add_node("generate_product_page", product_page_agent.run)
-    workflow.add_node("generate_comparison", comparison_agent.run)
+    # Add nodes; each carries both entry points so the compiled graph supports
+    # workflow.invoke (blocking) and workflow.ainvoke (async-native agents)
+    workflow.add_node("ingest", _node(ingest_agent))
+    workflow.add_node("generate_questions", _node(question_agent))
+    workflow.add_node("generate_faq", _node(faq_agent))
+    workflow.add_node("generate_product_page", _node(product_page_agent))
+    workflow.add_node("generate_comparison", _node(comparison_agent))
 
     # Set entry point
     workflow.set_entry_point("ingest")
 
-    # Sequential execution: ensures all outputs are generated
+    # Fan out: the FAQ chain and both page generators start as soon as ingest is done
     workflow.add_edge("ingest", "generate_questions")
+    workflow.add_edge("ingest", "generate_product_page")
+    workflow.add_edge("ingest", "generate_comparison")
     workflow.add_edge("generate_questions", "generate_faq")
-    workflow.add_edge("generate_faq", "generate_product_page")
-    workflow.add_edge("generate_product_page", "generate_comparison")
+    workflow.add_edge("generate_faq", END)
+    workflow.add_edge("generate_product_page", END)
     workflow.add_edge("generate_comparison", END)
 
-    return workflow.compile()
+    return workflow.compile(checkpointer=checkpointer)
+
 
+def product_input(source, faq_sink=None) -> Dict[str, Any]:
+    """Input state for one product: ``source`` is a JSON file path or a raw product record."""
+    state: Dict[str, Any] = {"product_data": source} if isinstance(source, dict) else {"data_path": str(source)}
+    if faq_sink is not None:
+        state["faq_sink"] = str(faq_sink)
+    return state
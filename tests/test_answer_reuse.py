@@ -0,0 +1,59 @@
+import dataclasses
+
+import pytest
+
+from src.answer_reuse import AnswerReuseCache, answer_fields
+from src.models import Product
+
+GLOWBOOST = Product(
+    name="GlowBoost Vitamin C Serum",
+    concentration="10% Vitamin C",
+    skin_type=("Oily", "Combination"),
+    key_ingredients=("Vitamin C", "Hyaluronic Acid"),
+    benefits=("Brightening", "Fades dark spots"),
+    how_to_use="Apply 2–3 drops in the morning before sunscreen",
+    side_effects=("Mild tingling for sensitive skin",),
+    price="₹699",
+)
+# Same price (the only Purchase key field), different active
+NIGHTRENEW = dataclasses.replace(
+    GLOWBOOST,
+    name="NightRenew Retinol Serum",
+    concentration="0.3% Retinol",
+    key_ingredients=("Retinol", "Squalane"),
+)
+QUESTION = ("Is it worth the price?", "Purchase")
+
+
+@pytest.fixture
+def cache():
+    return AnswerReuseCache()
+
+
+def test_answer_quoting_only_key_fields_is_reused(cache):
+    cache.put(*QUESTION, GLOWBOOST, "GlowBoost Vitamin C Serum costs ₹699 per bottle.")
+    assert cache.get(*QUESTION, NIGHTRENEW) == "NightRenew Retinol Serum costs ₹699 per bottle."
+
+
+@pytest.mark.parametrize(
+    "answer",
+    [
+        "At ₹699 you get 10% Vitamin C.",  # concentration
+        "₹699 buys Hyaluronic Acid and more.",  # key ingredient
+        "GlowBoost is fairly priced at ₹699.",  # shortened name
+    ],
+)
+def test_answer_quoting_other_fields_is_not_reused_for_a_different_product(cache, answer):
+    cache.put(*QUESTION, GLOWBOOST, answer)
+    assert cache.get(*QUESTION, NIGHTRENEW) is None
+    assert cache.get(*QUESTION, GLOWBOOST) == answer
+
+
+def test_answer_fields():
+    assert answer_fields("GlowBoost Vitamin C Serum costs ₹699.", GLOWBOOST) == {"price"}
+    assert answer_fields("GlowBoost suits oily skin, with 10% Vitamin C.", GLOWBOOST) == {
+        "name",
+        "skin_type",
+        "concentration",
+        "key_ingredients",
+    }
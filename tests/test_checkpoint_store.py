@@ -0,0 +1,56 @@
+import operator
+from typing import Annotated, List, TypedDict
+
+import pytest
+from langgraph.graph import END, START, StateGraph
+
+from src.checkpoint_store import SqliteCheckpointSaver
+
+
+class State(TypedDict):
+    done: Annotated[List[str], operator.add]
+
+
+def _workflow(checkpointer, runs, crash):
+    """ingest fans out to faq and product_page, which both feed comparison; ``crash`` names nodes that fail once."""
+
+    def node(name):
+        def run(state):
+            runs.append(name)
+            if name in crash:
+                crash.remove(name)
+                raise RuntimeError(f"{name} crashed")
+            return {"done": [name]}
+
+        return run
+
+    graph = StateGraph(State)
+    for name in ("ingest", "faq", "product_page", "comparison"):
+        graph.add_node(name, node(name))
+    graph.add_edge(START, "ingest")
+    graph.add_edge("ingest", "faq")
+    graph.add_edge("ingest", "product_page")
+    graph.add_edge(["faq", "product_page"], "comparison")
+    graph.add_edge("comparison", END)
+    return graph.compile(checkpointer=checkpointer)
+
+
+def test_resume_skips_completed_nodes(tmp_path):
+    path = tmp_path / "checkpoints.sqlite"
+    config = {"configurable": {"thread_id": "product"}}
+    runs: List[str] = []
+    with pytest.raises(RuntimeError):
+        _workflow(SqliteCheckpointSaver(path), runs, {"faq"}).invoke({"done": []}, config, durability="sync")
+    assert sorted(runs) == ["faq", "ingest", "product_page"]
+
+    # A new saver on the same file stands in for a restarted process
+    saver = SqliteCheckpointSaver(path)
+    runs.clear()
+    final = _workflow(saver, runs, set()).invoke(None, config, durability="sync")
+    assert runs == ["faq", "comparison"]
+    assert sorted(final["done"]) == ["comparison", "faq", "ingest", "product_page"]
+
+    saver.mark_completed("product")
+    assert saver.completed() == {"product"}
+    assert saver.get_tuple(config) is None
+    assert saver._conn.execute("SELECT COUNT(*) FROM writes").fetchone()[0] == 0
@@ -0,0 +1,125 @@
+import asyncio
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import httpx
+import openai
+import pytest
+
+from benchmarks import fake_llm
+from src import llm_scheduler
+from src.agents.data_ingestion_agent import parse_product
+from src.llm_clients import configure_clients, use_chat_model
+
+DATA_PATH = Path(__file__).resolve().parent.parent / "data" / "product_data.json"
+_REQUEST = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+
+
+@pytest.fixture
+def state():
+    product = parse_product(json.loads(DATA_PATH.read_text(encoding="utf-8")))
+    questions = [{"text": f"Question {index}?", "category": "Informational"} for index in range(20)]
+    return {"product": product, "questions": questions}
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    """Fake model behind a fast scheduler; records each call and lets a test rewrite FAQ replies.
+
+    ``fake.calls`` holds "faq" (chunk call) or "answer" (single-question call)
+    per model call and ``fake.asked`` the question count of each chunk call;
+    ``fake.faq`` maps a chunk reply to the text returned and
+    ``fake.answer`` may raise instead of answering.
+    """
+    fake = SimpleNamespace(calls=[], asked=[], faq=lambda reply: reply, answer=None)
+    reply = fake_llm.canned_reply
+
+    def recording(messages):
+        text = "\n".join(str(message.content) for message in messages)
+        kind = "faq" if "FAQ generation agent" in text else "answer" if "Answer this question" in text else "other"
+        fake.calls.append(kind)
+        if kind == "faq":
+            fake.asked.append(len(fake_llm._QUESTION_LINE.findall(text)))
+        if kind == "answer" and fake.answer is not None:
+            fake.answer()
+        return fake.faq(reply(messages)) if kind == "faq" else reply(messages)
+
+    monkeypatch.setattr(fake_llm, "canned_reply", recording)
+    monkeypatch.setattr(
+        llm_scheduler,
+        "_scheduler",
+        llm_scheduler.LLMScheduler(requests_per_minute=60_000, tokens_per_minute=10_000_000, base_backoff=0.001, max_backoff=0.01, max_attempts=2),
+    )
+    configure_clients()
+    use_chat_model(fake_llm.FakeChatModel)
+    return fake
+
+
+def _first_reply(rewrite):
+    """FAQ reply hook applying ``rewrite`` to the array of the first chunk reply only."""
+    seen = []
+
+    def faq(reply):
+        seen.append(reply)
+        if len(seen) > 1:
+            return reply
+        return rewrite(reply[reply.index("[") : reply.rindex("]") + 1])
+
+    return faq
+
+
+def _break_entry(array, position=3):
+    entries = [json.dumps(entry) for entry in json.loads(array)]
+    entries[position] = entries[position].replace('", "category"', '" "category"')
+    return "[" + ", ".join(entries) + "]"
+
+
+@pytest.mark.parametrize("streamed", [False, True])
+def test_one_malformed_entry_costs_one_re_ask(state, fake, tmp_path, streamed):
+    from src.agents_langchain import FaqAgent
+
+    fake.faq = _first_reply(_break_entry)
+    if streamed:
+        state = {**state, "faq_sink": tmp_path / "faq.ndjson"}
+    faqs = FaqAgent(chunk_size=None).run(state)["faqs"]
+    assert fake.calls == ["faq", "faq"] and fake.asked == [20, 1]
+    assert [faq["question"] for faq in faqs] == [q["text"] for q in state["questions"]]
+
+
+def test_truncated_reply_keeps_its_complete_entries(state, fake):
+    from src.agents_langchain import FaqAgent
+
+    fake.faq = _first_reply(lambda array: array[: len(array) * 3 // 5])
+    faqs = asyncio.run(FaqAgent(chunk_size=None).arun(state))["faqs"]
+    assert fake.calls == ["faq", "faq"] and 0 < fake.asked[1] < 10
+    assert [faq["question"] for faq in faqs] == [q["text"] for q in state["questions"]]
+
+
+def test_cancelling_the_run_is_not_swallowed(state, fake, monkeypatch):
+    from src.agents_langchain import FaqAgent
+
+    monkeypatch.setattr(fake_llm.FakeChatModel, "latency", fake_llm.parse_latency("const:5"))
+
+    async def cancel_run():
+        task = asyncio.create_task(FaqAgent(chunk_size=None).arun(state))
+        await asyncio.sleep(0.2)
+        task.cancel()
+        await task
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(cancel_run())
+    assert fake.calls == ["faq"]
+
+
+def test_fallback_is_retried_by_the_scheduler_only(state, fake):
+    from src.agents_langchain import FaqAgent
+
+    def timeout():
+        raise openai.APITimeoutError(request=_REQUEST)
+
+    fake.faq = lambda reply: "no json here"
+    fake.answer = timeout
+    with pytest.raises(openai.APITimeoutError):
+        FaqAgent().run({**state, "questions": state["questions"][:1]})
+    assert fake.calls.count("answer") == 2
@@ -0,0 +1,65 @@
+import time
+
+import pytest
+
+from src.json_stream import JsonArrayStream, extract_json
+
+
+def _feed_all(text, size=3):
+    parser = JsonArrayStream()
+    completed = []
+    for start in range(0, len(text), size):
+        completed.extend(parser.feed(text[start : start + size]))
+    return completed
+
+
+def test_array_stream_emits_each_element():
+    text = '```json\n[{"a": 1}, {"b": "x]}"}, [2, 3]]\n```'
+    assert _feed_all(text) == [{"a": 1}, {"b": "x]}"}, [2, 3]]
+
+
+def test_array_stream_ignores_braces_before_the_array():
+    text = 'Here you go {ok}: [{"question": "Q?", "answer": "A", "category": "Usage"}]'
+    assert _feed_all(text) == [{"question": "Q?", "answer": "A", "category": "Usage"}]
+
+
+def test_array_stream_skips_only_the_malformed_element():
+    text = '[{"a": 1}, {"b": 2 "c": 3}, {"d": 4}, {"e": '
+    assert _feed_all(text) == [{"a": 1}, None, {"d": 4}]
+
+
+def test_array_stream_stops_at_the_closing_bracket():
+    assert _feed_all('[{"a": 1}] trailing {"b": 2}') == [{"a": 1}]
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("Note {x} then [1]", [1]),
+        ('Fill in {name} below:\n{"description": "Bright"}', {"description": "Bright"}),
+        ('Here it is:\n```json\n{"primary": "A", "alternative": "B",}\n```\nDone.', {"primary": "A", "alternative": "B"}),
+        ('[{"text": "Q?", "category": "Usage"}] // generated, {edit} freely', [{"text": "Q?", "category": "Usage"}]),
+        ('[{"a": 1}, {"b": 2}, {"c": ', [{"a": 1}, {"b": 2}]),
+    ],
+)
+def test_extract_json(text, expected):
+    assert extract_json(text) == expected
+
+
+def test_extract_json_without_json_raises():
+    with pytest.raises(ValueError):
+        extract_json("No structured data {here}.")
+
+
+def test_extract_json_does_not_fall_back_to_a_nested_value():
+    with pytest.raises(ValueError):
+        extract_json('[{"a": 1} {"b": 2}]')
+
+
+def test_extract_json_scans_a_garbled_reply_once():
+    # Truncated and garbled: every bracket's candidate would run to the end of the text
+    text = "Answers {below}:\n[" + '{"question": "Q?", "answer": "A" "tags": [' * 1000
+    start = time.perf_counter()
+    with pytest.raises(ValueError):
+        extract_json(text)
+    assert time.perf_counter() - start < 0.5
@@ -0,0 +1,84 @@
+import asyncio
+
+import httpx
+import openai
+import pytest
+
+from src.llm_scheduler import LLMScheduler, is_rate_limit, is_transient
+
+_REQUEST = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+
+
+def _status_error(cls, status, headers=None):
+    return cls("error", response=httpx.Response(status, headers=headers, request=_REQUEST), body=None)
+
+
+def _scheduler(**kwargs):
+    settings = dict(requests_per_minute=60_000, tokens_per_minute=10_000_000, base_backoff=0.001, max_backoff=0.01)
+    return LLMScheduler(**{**settings, **kwargs})
+
+
+def _failing(*errors):
+    """Callable that raises ``errors`` in turn, then returns "ok"; records its attempts."""
+    attempts = []
+
+    def fn():
+        attempts.append(len(attempts))
+        if len(attempts) <= len(errors):
+            raise errors[len(attempts) - 1]
+        return "ok"
+
+    fn.attempts = attempts
+    return fn
+
+
+def test_error_classification():
+    assert is_rate_limit(_status_error(openai.RateLimitError, 429))
+    assert is_transient(_status_error(openai.InternalServerError, 503))
+    assert is_transient(openai.APITimeoutError(request=_REQUEST))
+    assert is_transient(openai.APIConnectionError(request=_REQUEST))
+    assert not is_transient(_status_error(openai.BadRequestError, 400))
+
+
+def test_rate_limit_is_retried_after_shared_backoff():
+    scheduler = _scheduler()
+    fn = _failing(_status_error(openai.RateLimitError, 429, {"retry-after": "0"}))
+    stats = {}
+    assert scheduler.call(fn, tokens=10, stats=stats) == "ok"
+    assert len(fn.attempts) == 2 and stats["retries"] == 1
+    assert scheduler.stats()["rate_limited"] == 1
+
+
+def test_server_errors_and_timeouts_are_retried():
+    scheduler = _scheduler()
+    fn = _failing(_status_error(openai.InternalServerError, 500), openai.APITimeoutError(request=_REQUEST))
+    assert scheduler.call(fn, tokens=10) == "ok"
+    assert len(fn.attempts) == 3
+    assert scheduler.stats()["retries"] == 2 and scheduler.stats()["rate_limited"] == 0
+
+
+def test_async_connection_error_is_retried():
+    scheduler = _scheduler()
+    fn = _failing(openai.APIConnectionError(request=_REQUEST))
+
+    async def call():
+        return fn()
+
+    assert asyncio.run(scheduler.acall(call, tokens=10)) == "ok"
+    assert len(fn.attempts) == 2
+
+
+def test_client_errors_are_not_retried():
+    scheduler = _scheduler()
+    fn = _failing(_status_error(openai.BadRequestError, 400))
+    with pytest.raises(openai.BadRequestError):
+        scheduler.call(fn, tokens=10)
+    assert len(fn.attempts) == 1
+
+
+def test_retries_stop_after_max_attempts():
+    scheduler = _scheduler(max_attempts=3)
+    fn = _failing(*[_status_error(openai.InternalServerError, 502) for _ in range(5)])
+    with pytest.raises(openai.InternalServerError):
+        scheduler.call(fn, tokens=10)
+    assert len(fn.attempts) == 3 and scheduler.stats()["in_flight"] == 0
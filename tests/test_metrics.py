@@ -0,0 +1,32 @@
+from src.metrics import RunMetrics
+
+
+def test_histogram_buckets_are_cumulative():
+    metrics = RunMetrics()
+    for duration in (0.0005, 0.003, 0.003, 0.2, 100.0):
+        metrics.span("node", "faq", 0.0, duration, {"node": "faq"})
+    text = metrics.prometheus()
+    metric = "content_pipeline_node_duration_seconds"
+    assert f'{metric}_bucket{{node="faq",le="0.001"}} 1' in text
+    assert f'{metric}_bucket{{node="faq",le="0.005"}} 3' in text
+    assert f'{metric}_bucket{{node="faq",le="0.25"}} 4' in text
+    assert f'{metric}_bucket{{node="faq",le="60"}} 4' in text
+    assert f'{metric}_bucket{{node="faq",le="+Inf"}} 5' in text
+    assert f'{metric}_count{{node="faq"}} 5' in text
+    assert f'{metric}_sum{{node="faq"}} 100.206500' in text
+
+
+def test_span_retention_is_bounded():
+    metrics = RunMetrics(max_spans=3)
+    for index in range(10):
+        metrics.span("llm", f"call{index}", float(index), index + 0.5, {"node": "faq"}, tokens=2)
+    names = [event["name"] for event in metrics.chrome_trace()["traceEvents"] if event["ph"] == "X"]
+    assert names == ["call7", "call8", "call9"]
+    text = metrics.prometheus()
+    assert 'content_pipeline_llm_duration_seconds_count{node="faq"} 10' in text
+    assert 'content_pipeline_llm_tokens_total{node="faq"} 20' in text
+
+    untraced = RunMetrics(max_spans=0)
+    untraced.span("llm", "call", 0.0, 1.0, {"node": "faq"})
+    assert not untraced.spans
+    assert 'content_pipeline_llm_duration_seconds_count{node="faq"} 1' in untraced.prometheus()
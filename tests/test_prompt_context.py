@@ -0,0 +1,65 @@
+import dataclasses
+import json
+from pathlib import Path
+
+import pytest
+from langchain_core.globals import set_llm_cache
+
+from benchmarks import fake_llm
+from src.agents.data_ingestion_agent import parse_product
+from src.llm_cache import enable_llm_cache
+from src.llm_clients import configure_clients, use_chat_model
+from src.prompt_context import fill_placeholders, product_context
+
+DATA_PATH = Path(__file__).resolve().parent.parent / "data" / "product_data.json"
+
+
+@pytest.fixture
+def product():
+    return parse_product(json.loads(DATA_PATH.read_text(encoding="utf-8")))
+
+
+@pytest.fixture
+def calls(monkeypatch, tmp_path):
+    """Fake model behind a fresh LLM cache; records the agent behind each model call."""
+    made = []
+    reply = fake_llm.canned_reply
+
+    def recording(messages):
+        text = "\n".join(str(message.content) for message in messages)
+        made.append("faq" if "FAQ generation agent" in text else "questions" if "question generation" in text else "other")
+        return reply(messages)
+
+    monkeypatch.setattr(fake_llm, "canned_reply", recording)
+    configure_clients()
+    use_chat_model(fake_llm.FakeChatModel)
+    enable_llm_cache(tmp_path / "llm_cache.sqlite")
+    yield made
+    set_llm_cache(None)
+
+
+def test_placeholders_round_trip(product):
+    context = product_context(product, ("price",))
+    assert product.price not in context
+    assert json.loads(context)["price"] == "<<price>>"
+    assert fill_placeholders("Costs <<price>>.", product, ("price",)) == f"Costs {product.price}."
+
+
+def test_price_only_change_makes_no_question_or_faq_calls(product, calls):
+    from src.agents_langchain import FaqAgent, QuestionGenerationAgent
+
+    questions, faqs = QuestionGenerationAgent(), FaqAgent()
+
+    def generate(item):
+        state = {"product": item, **questions.run({"product": item})}
+        return faqs.run(state)["faqs"]
+
+    generate(product)
+    assert calls.count("questions") == 1 and calls.count("faq") >= 1
+    calls.clear()
+
+    repriced = dataclasses.replace(product, price="₹999")
+    answers = generate(repriced)
+    assert calls == []
+    purchase = [faq["answer"] for faq in answers if faq["category"] == "Purchase"]
+    assert purchase and all("₹999" in answer for answer in purchase)
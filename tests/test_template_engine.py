@@ -0,0 +1,22 @@
+from src.template_engine import Template, TemplateField, compile_template
+
+
+def _template():
+    return Template(
+        name="page",
+        fields=[
+            TemplateField("title", lambda ctx: ctx["title"]),
+            TemplateField("note", lambda ctx: "fixed", constant=True),
+            TemplateField("choice", lambda ctx: {"primary": "A", "tags": ["x"]}, constant=True),
+        ],
+    )
+
+
+def test_constant_fields_are_not_shared_between_pages():
+    render = compile_template(_template())
+    first = render({"title": "one"})
+    first["choice"]["primary"] = "changed"
+    first["choice"]["tags"].append("y")
+    second = render({"title": "two"})
+    assert second == {"template": "page", "title": "two", "note": "fixed", "choice": {"primary": "A", "tags": ["x"]}}
+    assert second["choice"] is not first["choice"]